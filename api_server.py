@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import tornado.httpserver
+import tornado.ioloop
+import tornado.web
+
+from bank_registry import DEFAULT_BANK, discover_banks
+from progress_store import create_progress_store
+from quiz_core import (
+    AIContentService, ContentCache, GenerationQueue, QuizService, UsageLedger, cache_backend_from_config, metrics,
+    parse_api_keys, public_question,
+)
+from quiz_core.ai import GenerationFailed, revalidate_rate
+
+
+ROOT = Path(__file__).parent
+QUESTION_MAX_AGE = 300  # A bank edit shows up within five minutes; clients then revalidate with the ETag
+AI_MAX_AGE = 3600
+IDLE_CONNECTION_TIMEOUT = 75  # Seconds a kept-alive connection may sit idle
+MAX_PAGE = 200
+RETRY_AFTER = 30  # Seconds a client should wait after an overloaded (503) AI response
+# AI requests may wait in the generation queue; give them their own threads so waits never block other handlers
+AI_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ai")
+
+
+class JsonHandler(tornado.web.RequestHandler):
+    """Base handler: JSON bodies, JSON errors and explicit cache headers.
+
+    Tornado adds an ETag to every 200 GET response and answers a matching
+    If-None-Match with 304, so clients only re-download changed payloads.
+    """
+
+    def initialize(self, service):
+        self.service = service
+
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+
+    def write_json(self, payload, max_age=None, revalidate=False):
+        """`max_age` lets clients reuse the response; `revalidate` makes them check its ETag every time."""
+        if max_age:
+            self.set_header("Cache-Control", f"public, max-age={max_age}")
+        elif revalidate:
+            # Tornado sets the ETag and answers If-None-Match with 304
+            self.set_header("Cache-Control", "public, no-cache")
+        else:
+            self.set_header("Cache-Control", "no-store")
+        self.finish(json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+
+    def write_error(self, status_code, **kwargs):
+        self.set_header("Cache-Control", "no-store")
+        if status_code == 503:
+            self.set_header("Retry-After", str(RETRY_AFTER))
+        self.finish(json.dumps({"error": self._reason}))
+
+    def get_store(self, code):
+        try:
+            return self.service.store(code)
+        except KeyError:
+            raise tornado.web.HTTPError(404, reason=f"Unknown exam {code}")
+
+    def get_index(self, store, question_id):
+        idx = store.index_of(question_id)
+        if idx is None:
+            raise tornado.web.HTTPError(404, reason=f"Unknown question {question_id}")
+        return idx
+
+    async def run_blocking(self, fn, *args, executor=None):
+        return await tornado.ioloop.IOLoop.current().run_in_executor(executor, fn, *args)
+
+
+class ExamsHandler(JsonHandler):
+    def get(self):
+        exams = [{"code": bank.code, "title": bank.title} for bank in self.service.banks.values()]
+        self.write_json({"exams": exams}, revalidate=True)
+
+
+class QuestionListHandler(JsonHandler):
+    async def get(self, code):
+        store = await self.run_blocking(self.get_store, code)
+        query = self.get_argument("q", "")
+        order = store.search(query) if query else range(len(store))
+        try:
+            offset = max(0, int(self.get_argument("offset", 0)))
+            limit = min(MAX_PAGE, max(1, int(self.get_argument("limit", 50))))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="offset and limit must be integers")
+        page = [{"id": store[i]['id'], "topic": store[i]['topic']} for i in order[offset:offset + limit]]
+        self.write_json({"total": len(order), "offset": offset, "questions": page}, revalidate=True)
+
+
+class QuestionHandler(JsonHandler):
+    async def get(self, code, question_id):
+        store = await self.run_blocking(self.get_store, code)
+        idx = self.get_index(store, question_id)
+        self.write_json(public_question(store[idx]), max_age=QUESTION_MAX_AGE)
+
+
+class AnswerHandler(JsonHandler):
+    async def post(self, code, question_id):
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="Body must be JSON")
+        if not body.get("answer"):
+            raise tornado.web.HTTPError(400, reason="Missing answer")
+        await self.run_blocking(self.get_store, code)
+        result = await self.run_blocking(
+            self.service.submit_answer, code, body.get("learner"), question_id, str(body["answer"])
+        )
+        if result is None:
+            raise tornado.web.HTTPError(404, reason=f"Unknown question {question_id}")
+        self.write_json(result)
+
+
+class ProgressHandler(JsonHandler):
+    async def get(self, code, learner_id):
+        await self.run_blocking(self.get_store, code)
+        progress = await self.run_blocking(self.service.progress, code, learner_id)
+        if progress is None:
+            raise tornado.web.HTTPError(404, reason="Progress storage is not configured")
+        self.write_json(progress)
+
+
+class AIContentHandler(JsonHandler):
+    KINDS = {"explanation": "explanations", "theory": "theories"}
+
+    async def get(self, code, question_id, kind):
+        store = await self.run_blocking(self.get_store, code)
+        self.get_index(store, question_id)
+        lang = self.get_argument("lang", "vi")
+        generate = self.get_argument("generate", "0") == "1"
+        # Cache reads may hit Drive and generation calls Gemini: keep both off the event loop
+        owner = self.get_argument("learner", None) or self.request.remote_ip  # Fair share per client
+        try:
+            text = await self.run_blocking(
+                self.service.ai_content, code, question_id, self.KINDS[kind], lang, generate, owner, executor=AI_EXECUTOR
+            )
+        except GenerationFailed as e:
+            # Errors are never cached: write_error sends no-store
+            if e.busy:
+                raise tornado.web.HTTPError(503, reason="AI generation is overloaded, retry later")
+            raise tornado.web.HTTPError(502, reason="AI generation failed")
+        if not text:
+            raise tornado.web.HTTPError(404, reason="Not generated yet")
+        self.write_json({"question_id": question_id, "lang": lang, "text": text}, max_age=AI_MAX_AGE)
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.set_header("Cache-Control", "no-store")
+        self.finish(metrics.REGISTRY.render())
+
+
+def log_request(handler):
+    """Per-request latency histogram (no-op unless metrics are enabled)."""
+    metrics.observe(
+        "http_request_seconds", handler.request.request_time(),
+        handler=type(handler).__name__, status=handler.get_status(),
+    )
+
+
+def make_app(service):
+    args = {"service": service}
+    exam = r"([A-Za-z0-9-]+)"
+    routes = [(r"/metrics", MetricsHandler)] if metrics.enabled() else []
+    return tornado.web.Application(routes + [
+        (r"/api/exams", ExamsHandler, args),
+        (rf"/api/exams/{exam}/questions", QuestionListHandler, args),
+        (rf"/api/exams/{exam}/questions/(\d+)", QuestionHandler, args),
+        (rf"/api/exams/{exam}/questions/(\d+)/answer", AnswerHandler, args),
+        (rf"/api/exams/{exam}/questions/(\d+)/(explanation|theory)", AIContentHandler, args),
+        (rf"/api/exams/{exam}/progress/([A-Za-z0-9_-]+)", ProgressHandler, args),
+    ], compress_response=True, log_function=log_request)
+
+
+def build_service(config=os.environ):
+    """QuizService configured like the app: same banks, progress backend and AI cache."""
+    banks = discover_banks(ROOT, ROOT / "banks")
+    progress = None
+    if config.get("PROGRESS_BACKEND") == "sqlite":
+        progress = create_progress_store("sqlite", path=config.get("PROGRESS_DB_PATH", ROOT / "progress.db"))
+    cache_path = config.get("AI_CACHE_PATH", ROOT / "ai_cache.json")
+    api_keys = parse_api_keys(config)
+    queue = GenerationQueue.from_config(config, default_slots=max(1, len(api_keys)))
+    metrics.register_gauge("ai_queue_depth", queue.depth)
+    metrics.register_gauge("ai_generations_active", queue.active)
+    usage = UsageLedger(config.get("AI_USAGE_PATH", ROOT / "ai_usage_api.json"))  # Not shared with the app's file
+    ai = AIContentService(api_keys, ContentCache(cache_backend_from_config(config, cache_path)), queue=queue,
+                          revalidate_per_minute=revalidate_rate(config), usage=usage)
+    if ai.revalidator is not None:
+        metrics.register_gauge("ai_stale_pending", lambda: len(ai.revalidator))
+    return QuizService(banks, progress, ai)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON API over the question banks.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--preload", action="store_true", help=f"Parse {DEFAULT_BANK} before accepting requests")
+    args = parser.parse_args()
+
+    metrics.configure()
+    service = build_service()
+    if args.preload and DEFAULT_BANK in service.banks:
+        service.store(DEFAULT_BANK)
+
+    # HTTP/1.1 keep-alive is on by default; idle connections are closed after the timeout
+    server = tornado.httpserver.HTTPServer(make_app(service), idle_connection_timeout=IDLE_CONNECTION_TIMEOUT, xheaders=True)
+    server.listen(args.port, args.host)
+    print(f"Serving {', '.join(service.banks) or 'no banks'} on http://{args.host}:{args.port}/api/exams")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
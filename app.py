@@ -1,5 +1,7 @@
 import streamlit as st
+import hmac
 import json
+import numpy as np
 import time
 from pathlib import Path
 
@@ -7,30 +9,225 @@ import os
 
 # Import custom modules
 from page_setup import setup_page_config, inject_seo, hide_streamlit_branding, load_custom_css
-from ai_service import init_ai_session_state, get_ai_explanation, get_ai_theory
+from ai_service import (
+    BUSY_RESPONSE, init_ai_session_state, get_access_counter, get_ai_explanation, get_ai_theory, session_memory_usage,
+)
 from ui_components import (
     render_page_header, render_question_header, render_question_card,
     render_answer_feedback, render_auto_scroll_script, render_ai_explanation,
     render_ai_theory, render_navigation_buttons, render_language_selector,
-    render_footer, render_scroll_to_top, render_preserve_scroll
+    render_footer, render_scroll_to_top, render_preserve_scroll, render_filter_panel,
+    render_related_questions, render_progress_stats, render_exam_launcher, render_tools_panel,
+    render_review_launcher, render_exam_selector, render_memory_usage,
+    render_exam_header, render_exam_options, render_exam_navigation, render_exam_result
+)
+from bank_registry import DEFAULT_BANK, ExamBank, discover_banks
+from parser_service import DEFAULT_META_MARKER, parse_markdown_file
+from progress_store import create_progress_store, new_learner_id
+from question_store import QuestionStore
+from scoring_service import answer_mask, mask_letters
+from exam_service import MockExam
+from review_service import ReviewScheduler
+from shuffle_service import ShuffledOrder, new_seed
+from session_cache import sessions_usage
+from quiz_core import RerunProfiler, metrics
+
+
+# Bank files next to the app, in banks/ or in the BANK_DIR directory
+BANK_DIRS = (Path(__file__).parent, Path(__file__).parent / "banks", *filter(None, [os.environ.get("BANK_DIR")]))
+
+PROFILE_MAX_RERUNS = 50  # Upper bound for ?profile=N
+AI_REQUEST_WEIGHT = 3.0  # An AI request counts as this many question views in the access counters
+
+# Session state that belongs to the selected exam and is reset when switching banks
+EXAM_SCOPED_STATE = (
+    'data_loaded', 'current_index', 'user_answers', 'question_order', 'question_order_total',
+    'shuffle_seed', 'review_scheduler', 'review_queue', 'answer_bits', 'session_answered',
+    'active_filters', 'filter_result_count', 'mock_exam', 'pending_question_id',
+    'search_input', 'tag_filter', 'hide_duplicates', 'shuffle_toggle',
 )
-from parser_service import parse_markdown_file
 
-# Setup page configuration
-setup_page_config()
-inject_seo()
+@st.cache_resource(ttl=300)
+def get_bank_registry():
+    """Exam banks by code. Only file headers are read here; questions load per bank on first use."""
+    return discover_banks(*BANK_DIRS)
+
+def get_current_bank():
+    """Bank selected by the ?exam= query param, falling back to the default bank."""
+    banks = get_bank_registry()
+    code = st.session_state.get('exam_code')
+    if code not in banks:
+        code = str(st.query_params.get("exam", DEFAULT_BANK)).upper()
+        if code not in banks:
+            code = DEFAULT_BANK if DEFAULT_BANK in banks else next(iter(banks), DEFAULT_BANK)
+        st.session_state.exam_code = code
+    if code in banks:
+        return banks[code]
+    # No bank on disk: keep the default identity so the upload flow behaves as before
+    return ExamBank(DEFAULT_BANK, DEFAULT_BANK, Path(__file__).parent / "SAA_C03.md", DEFAULT_META_MARKER)
+
+def switch_exam(code):
+    """Select another bank and reload progress for it."""
+    for key in EXAM_SCOPED_STATE:
+        st.session_state.pop(key, None)
+    st.session_state.exam_code = code
+    for param in ("q", "id", "seed"):
+        st.query_params.pop(param, None)
+    st.query_params["exam"] = code
+    st.rerun()
+
+# Setup page configuration (titled after the selected exam, like the page header)
+_page_bank = get_current_bank()
+setup_page_config(None if _page_bank.is_default else _page_bank.title)
+inject_seo(None if _page_bank.is_default else _page_bank.title)
 hide_streamlit_branding()
 load_custom_css()
 
+@st.cache_resource
+def init_metrics():
+    """Turn on timing spans/metrics once per process when METRICS_FILE or METRICS_PORT is configured."""
+    keys = ("METRICS_ENABLED", "METRICS_FILE", "METRICS_PORT", "METRICS_HOST")
+    config = {k: st.secrets.get(k, os.environ.get(k)) for k in keys}
+    if metrics.configure({k: v for k, v in config.items() if v}):
+        metrics.register_gauge("session_ai_bytes", lambda: sum(u['bytes'] for u in sessions_usage()))
+        metrics.register_gauge("session_ai_memories", lambda: len(sessions_usage()))
+    return metrics.enabled()
+
+@st.cache_resource
+def get_profiler():
+    """Process-wide rerun profiler. PROFILE_RERUNS=N profiles the next N reruns of any session."""
+    directory = st.secrets.get("PROFILE_DIR", os.environ.get("PROFILE_DIR", Path(__file__).parent / "profiles"))
+    return RerunProfiler(directory, st.secrets.get("PROFILE_RERUNS", os.environ.get("PROFILE_RERUNS", 0)))
+
+def arm_session_profiling():
+    """?profile=N&profile_token=... profiles this session's next N reruns (admin only, needs PROFILE_TOKEN)."""
+    if "profile" not in st.query_params:
+        return
+    token = st.secrets.get("PROFILE_TOKEN", os.environ.get("PROFILE_TOKEN"))
+    given = st.query_params.get("profile_token", "")
+    # Compared as bytes: compare_digest rejects non-ASCII str
+    if token and hmac.compare_digest(str(token).encode(), given.encode()):
+        try:
+            st.session_state.profile_reruns = min(int(st.query_params["profile"]), PROFILE_MAX_RERUNS)
+        except ValueError:
+            pass
+    # Never keep the token in the URL (permalinks are shared)
+    st.query_params.pop("profile", None)
+    st.query_params.pop("profile_token", None)
+
+def rerun_action():
+    """Best-effort name of what triggered this rerun: a pending AI request or the state keys that changed."""
+    if st.session_state.get('pending_ai_request'):
+        return f"ai_{st.session_state.pending_ai_request}"
+    previous = st.session_state.get('profile_snapshot')
+    if previous is None:
+        return "first"
+    changed = sorted(k for k, v in profile_snapshot().items() if previous.get(k) != v)
+    return "+".join(changed[:3]) or "rerun"
+
+def profile_snapshot():
+    return {
+        k: v for k, v in st.session_state.items()
+        if isinstance(v, (str, int, float, bool)) and not k.startswith('profile_')
+    }
+
+def run_main():
+    """main(), under cProfile when this session or the process has profiled reruns left."""
+    arm_session_profiling()
+    profiler = get_profiler()
+    remaining = st.session_state.get('profile_reruns', 0)
+    if not remaining and not profiler.remaining:
+        main()
+        return
+
+    def on_write(path):
+        # A session's own reruns are only used up when its profile was written
+        if remaining:
+            st.session_state.profile_reruns = remaining - 1
+
+    action = rerun_action()
+    try:
+        profiler.run(main, lambda: (st.query_params.get("id"), action), budget=not remaining, on_write=on_write)
+    finally:
+        # Compared against on the next profiled rerun to name its action
+        st.session_state.profile_snapshot = profile_snapshot()
+
 @st.cache_data
-def load_data(mtime):
+def load_data(path, meta_marker, mtime):
     """Handles file loading logic. Cache invalidated if mtime changes."""
-    fpath = Path(__file__).parent / "SAA_C03.md"
+    fpath = Path(path)
     if fpath.exists():
-        content = fpath.read_text(encoding='utf-8')
-        return parse_markdown_file(content)
+        with metrics.span("load_data"):
+            content = fpath.read_text(encoding='utf-8')
+            return parse_markdown_file(content, meta_marker)
     return None
 
+@st.cache_resource
+def load_question_store(path, meta_marker, mtime):
+    """Question bank with its indexes, built once per file version and shared across sessions."""
+    questions = load_data(path, meta_marker, mtime)
+    if questions is None:
+        return None
+    return QuestionStore(questions)
+
+@st.cache_resource
+def load_uploaded_store(content):
+    """Question store for an uploaded bank."""
+    return QuestionStore(parse_markdown_file(content))
+
+@st.cache_resource
+def get_progress_store():
+    """Shared server-side progress backend. None keeps progress in browser Local Storage."""
+    backend = st.secrets.get("PROGRESS_BACKEND", os.environ.get("PROGRESS_BACKEND"))
+    if backend == "sqlite":
+        default_path = Path(__file__).parent / "progress.db"
+        path = st.secrets.get("PROGRESS_DB_PATH", os.environ.get("PROGRESS_DB_PATH", default_path))
+        return create_progress_store(backend, path=path)
+    return create_progress_store(backend)
+
+def get_progress_key():
+    """Progress store key for this learner and the selected exam."""
+    return get_current_bank().progress_key(get_learner_id())
+
+def get_learner_id():
+    """Anonymous learner token, kept in the URL so progress follows the link."""
+    if 'learner_id' not in st.session_state:
+        learner_id = st.query_params.get("u")
+        if not learner_id:
+            learner_id = new_learner_id()
+            st.query_params["u"] = learner_id
+        st.session_state.learner_id = learner_id
+    return st.session_state.learner_id
+
+def ensure_answer_arrays(store):
+    """Keep bitmask answer arrays aligned with the loaded bank."""
+    key = store.answer_key
+    if len(st.session_state.get('answer_bits', ())) != key.size:
+        st.session_state.answer_bits = key.encode_answers(st.session_state.user_answers)
+        st.session_state.session_answered = np.zeros(key.size, dtype=bool)
+
+def save_user_answer(store, question_id, ans, localS):
+    """Persist an answer to the server-side store or browser Local Storage."""
+    st.session_state.user_answers[question_id] = ans
+    idx = store.id_index.get(question_id)
+    if idx is not None:
+        st.session_state.answer_bits[idx] = answer_mask(ans)
+        st.session_state.session_answered[idx] = True
+        # Every answer reschedules the question for spaced repetition
+        correct = answer_mask(ans) == store.answer_key.correct[idx]
+        st.session_state.review_scheduler.review(question_id, correct)
+    
+    review_state = st.session_state.review_scheduler.serialize()
+    progress = get_progress_store()
+    if progress is not None:
+        progress_key = get_progress_key()
+        progress.record_answer(progress_key, question_id, ans)
+        progress.save_state(progress_key, "review", review_state)
+    else:
+        prefix = get_current_bank().storage_prefix
+        localS.setItem(f"{prefix}_user_answers", json.dumps(st.session_state.user_answers))
+        localS.setItem(f"{prefix}_review", review_state, key="set_review")
+
 def init_session_state(localS):
     """Initialize all session state variables."""
     # Load state from Local Storage/URL if session is fresh
@@ -42,14 +239,36 @@ def init_session_state(localS):
             st.session_state.current_index = max(0, q_idx)
         except:
             st.session_state.current_index = 0
-             
-        # Restore Answers from Local Storage
+        
+        # Permalinks carry the official question number; resolved once the bank is loaded
+        st.session_state.pending_question_id = st.query_params.get("id")
+        
+        # Restore a shared/resumed shuffled run from its seed
         try:
-            saved_ans = localS.getItem("saa_c03_user_answers")
-            if saved_ans:
-                st.session_state.user_answers = json.loads(saved_ans)
-        except:
-            pass
+            st.session_state.shuffle_seed = int(st.query_params["seed"])
+            st.session_state.shuffle_toggle = True
+        except (KeyError, ValueError):
+            st.session_state.shuffle_seed = None
+             
+        store = get_progress_store()
+        if store is not None:
+            # Restore Answers from the server-side store (single keyed read)
+            try:
+                progress = store.load(get_progress_key())
+                st.session_state.user_answers = progress["answers"]
+                st.session_state.review_scheduler = ReviewScheduler.deserialize(progress["state"].get("review"))
+            except Exception as e:
+                print(f"Progress Load Error: {e}")
+        else:
+            # Restore Answers from Local Storage
+            try:
+                prefix = get_current_bank().storage_prefix
+                saved_ans = localS.getItem(f"{prefix}_user_answers")
+                if saved_ans:
+                    st.session_state.user_answers = json.loads(saved_ans)
+                st.session_state.review_scheduler = ReviewScheduler.deserialize(localS.getItem(f"{prefix}_review"))
+            except:
+                pass
             
         st.session_state.data_loaded = True
 
@@ -60,17 +279,42 @@ def init_session_state(localS):
         st.session_state.user_answers = {}
     if 'question_order' not in st.session_state: 
         st.session_state.question_order = []
+    if 'shuffle_seed' not in st.session_state:
+        st.session_state.shuffle_seed = None
+    if 'review_scheduler' not in st.session_state:
+        st.session_state.review_scheduler = ReviewScheduler()
+        st.session_state.review_queue = []
     if 'active_ai_section' not in st.session_state:
         st.session_state.active_ai_section = None  # Can be 'theory', 'explanation', or None
     if 'language' not in st.session_state:
         st.session_state.language = 'vi'  # Default to Vietnamese
     if 'scroll_to_top' not in st.session_state:
         st.session_state.scroll_to_top = False
+    if 'active_filters' not in st.session_state:
+        st.session_state.active_filters = ("", (), False)  # (search query, service tags, hide duplicates)
+        st.session_state.filter_result_count = None
     
     # Initialize AI session state
     init_ai_session_state()
 
-def handle_navigation(idx_ptr, total_indices, total_questions):
+def on_jump(new_idx):
+    """Jump to a position in the current question order."""
+    st.session_state.current_index = new_idx
+    st.session_state.scroll_to_top = True
+    st.query_params["q"] = str(st.session_state.current_index + 1)
+    st.rerun()
+
+def position_in_order(target_idx, idx_ptr):
+    """Position of a bank index in the current order, drilling it in after `idx_ptr` if filtered out."""
+    order = st.session_state.question_order
+    if target_idx in order:
+        return order.index(target_idx)
+    order = list(order)
+    order.insert(idx_ptr + 1, target_idx)
+    st.session_state.question_order = order
+    return idx_ptr + 1
+
+def handle_navigation(store, idx_ptr, total_indices, total_questions):
     """Handle navigation button clicks."""
     def on_prev():
         if st.session_state.current_index > 0:
@@ -86,23 +330,175 @@ def handle_navigation(idx_ptr, total_indices, total_questions):
             st.query_params["q"] = str(st.session_state.current_index + 1)
             st.rerun()
     
-    def on_jump(new_idx):
-        st.session_state.current_index = new_idx
-        st.session_state.scroll_to_top = True
-        st.query_params["q"] = str(st.session_state.current_index + 1)
+    def on_jump_id(question_id):
+        target_idx = store.index_of(question_id)
+        if target_idx is None:
+            return False
+        position = position_in_order(target_idx, idx_ptr)
+        if position != idx_ptr:
+            on_jump(position)
+    
+    render_navigation_buttons(idx_ptr, total_indices, on_prev, on_next, on_jump, on_jump_id)
+
+def set_question_order(order, total):
+    """Replace the active question order and restart at its first position."""
+    st.session_state.question_order = order
+    st.session_state.question_order_total = total
+    st.session_state.current_index = 0
+    st.session_state.scroll_to_top = True
+    st.query_params["q"] = "1"
+
+def build_question_order(store, filters, seed):
+    """Filtered question order, permuted in place of a copy when a shuffle seed is set."""
+    order = store.filter_order(*filters)
+    if seed is not None:
+        order = ShuffledOrder(order, seed)
+    return order
+
+def restore_filter_widgets():
+    """Re-seed the filter widgets from the applied filters.
+
+    Streamlit drops the state of keyed widgets that are not rendered in a
+    run, as happens during a mock exam. Without this the widgets come back
+    empty and handle_filters would reset the order, seed and position.
+    """
+    query, tags, collapse_duplicates = st.session_state.active_filters
+    defaults = {
+        'search_input': query,
+        'tag_filter': list(tags),
+        'hide_duplicates': collapse_duplicates,
+        'shuffle_toggle': st.session_state.shuffle_seed is not None,
+    }
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+def handle_filters(store, container):
+    """Rebuild question order from the search query, service tags and shuffle mode."""
+    def on_filter(query, tags, collapse_duplicates, shuffle):
+        filters = (query.strip(), tuple(tags), collapse_duplicates)
+        seed = None
+        if shuffle:
+            seed = st.session_state.shuffle_seed or new_seed()
+        if filters != st.session_state.active_filters or seed != st.session_state.shuffle_seed:
+            st.session_state.active_filters = filters
+            st.session_state.shuffle_seed = seed
+            if seed is None:
+                st.query_params.pop("seed", None)
+            else:
+                st.query_params["seed"] = str(seed)
+            order = build_question_order(store, filters, seed)
+            st.session_state.filter_result_count = len(order) if any(filters) else None
+            if order:
+                set_question_order(order, len(store))
+                st.rerun()
+        return st.session_state.filter_result_count
+    
+    render_filter_panel(store.tag_counts(), on_filter, container)
+
+def handle_related(store, real_idx, idx_ptr):
+    """Show related questions and jump to the selected one."""
+    def on_select(target_idx):
+        on_jump(position_in_order(target_idx, idx_ptr))
+    
+    related = [(j, store[j]) for j, _ in store.related(real_idx)]
+    render_related_questions(related, on_select)
+
+def handle_exam_launcher(store, container):
+    """Sidebar control that starts a mock exam."""
+    def on_start(seed):
+        st.session_state.mock_exam = MockExam(len(store), seed=seed)
+        st.rerun()
+    
+    render_exam_launcher(on_start, container)
+
+def handle_review_launcher(store, container):
+    """Start a spaced-repetition session from the questions that are due."""
+    scheduler = st.session_state.review_scheduler
+    
+    def on_start():
+        # Questions popped for an earlier review session but never answered go back first
+        scheduler.restore(st.session_state.get('review_queue', []))
+        queue = [qid for qid in scheduler.pop_due() if qid in store.id_index]
+        st.session_state.review_queue = queue
+        if queue:
+            set_question_order([store.id_index[qid] for qid in queue], len(store))
+            st.rerun()
+    
+    render_review_launcher(scheduler.due_count(), scheduler.next_due(), on_start, container)
+
+@st.fragment(run_every=30)
+def render_exam_timer():
+    """Refresh the countdown; when time is up, rerun the app so the attempt is graded."""
+    exam = st.session_state.get('mock_exam')
+    if exam is None or exam.finished:
+        return
+    if exam.expired():
+        st.rerun()
+    remaining = int(exam.remaining())
+    st.caption(f"⏱️ {remaining // 60:02d}:{remaining % 60:02d}")
+
+@st.fragment
+def render_mock_exam(store):
+    """Exam question view. Runs as a fragment so answering and paging skip full-page reruns."""
+    exam = st.session_state.mock_exam
+    if exam.expired():
+        exam.grade(store.answer_key)
+        st.rerun()
+    
+    pos = exam.position
+    q = store[exam.questions[pos]]
+    render_exam_header(pos, len(exam), exam.answered_count(), exam.seed)
+    render_question_card(q["question"], q['is_multiselect'])
+    
+    # Answers are recorded as soon as they are selected; feedback waits for grading
+    letters = render_exam_options(q, mask_letters(exam.answers[pos]), key=f"exam_{exam.seed}_{pos}")
+    exam.answer(pos, letters)
+    
+    # Paging runs as widget callbacks, so it costs a single fragment rerun
+    def on_prev():
+        exam.position = max(0, pos - 1)
+    
+    def on_next():
+        exam.position = min(len(exam) - 1, pos + 1)
+    
+    def on_finish():
+        exam.grade(store.answer_key)
         st.rerun()
     
-    render_navigation_buttons(idx_ptr, total_indices, on_prev, on_next, on_jump)
+    render_exam_navigation(pos, len(exam), on_prev, on_next, on_finish)
+
+def handle_mock_exam(store):
+    """Render the running exam or its graded result."""
+    exam = st.session_state.mock_exam
+    if exam.expired() and not exam.finished:
+        exam.grade(store.answer_key)
+    
+    if exam.finished:
+        def on_exit():
+            del st.session_state.mock_exam
+            st.rerun()
+        
+        review = [
+            (store[idx], mask_letters(exam.answers[pos]), exam.result['credit'][pos])
+            for pos, idx in enumerate(exam.questions)
+        ]
+        render_exam_result(exam.result, review, on_exit)
+        return
+    
+    render_exam_timer()
+    render_mock_exam(store)
 
 def get_current_question_index(questions):
     """Determine current question index."""
     indices = st.session_state.question_order
-    idx_ptr = st.session_state.current_index
+    idx_ptr = min(st.session_state.current_index, len(indices) - 1)
+    st.session_state.current_index = idx_ptr
     real_idx = indices[idx_ptr]
     
     return indices, idx_ptr, real_idx
 
-def render_question_form(q, localS, is_loading=False, loading_type=None):
+def render_question_form(store, q, localS, is_loading=False, loading_type=None):
     """Render the question form and handle submissions."""
     # Get language for AI generation (User preference)
     ai_lang = st.session_state.get('language', 'vi')
@@ -148,17 +544,19 @@ def render_question_form(q, localS, is_loading=False, loading_type=None):
     # Handle answer submission
     if sub and user_ch:
         ans = "".join(sorted(user_ch))
-        st.session_state.user_answers[q['id']] = ans
-        localS.setItem("saa_c03_user_answers", json.dumps(st.session_state.user_answers))
+        save_user_answer(store, q['id'], ans, localS)
     
     return theory_req, explain_req
 
 def main():
-    # Import here to avoid module load errors
-    from streamlit_local_storage import LocalStorage
-    
-    # Initialize Local Storage
-    localS = LocalStorage()
+    # Local Storage is only needed when no server-side store is configured
+    localS = None
+    if get_progress_store() is None:
+        # Import here to avoid module load errors
+        from streamlit_local_storage import LocalStorage
+        
+        # Initialize Local Storage
+        localS = LocalStorage()
     init_session_state(localS)
     
     # Handle Scroll To Top
@@ -166,32 +564,60 @@ def main():
         render_scroll_to_top()
         st.session_state.scroll_to_top = False
     
-    # Load questions
-    fpath = Path(__file__).parent / "SAA_C03.md"
-    mtime = os.path.getmtime(fpath) if fpath.exists() else 0
-    questions = load_data(mtime)
+    # Load questions (only the selected bank is parsed and indexed)
+    bank = get_current_bank()
+    store = load_question_store(str(bank.path), bank.meta_marker, bank.mtime())
     from translations import get_text
     
-    if questions is None:
+    if store is None:
         # UI English
         st.header(get_text('en', 'settings'))
         uploaded = st.file_uploader(get_text('en', 'upload_file'), type=["md"])
         if uploaded:
             content = uploaded.getvalue().decode("utf-8")
-            questions = parse_markdown_file(content)
+            store = load_uploaded_store(content)
         else:
             st.stop()
+    questions = store.questions
     total = len(questions)
+    header_title = None if bank.is_default else bank.title
+    
+    # Init question order (kept while it was built for this bank)
+    if st.session_state.get('question_order_total') != total or not st.session_state.question_order:
+        st.session_state.question_order = build_question_order(
+            store, st.session_state.active_filters, st.session_state.shuffle_seed
+        )
+        st.session_state.question_order_total = total
+    
+    # Open the question from a permalink (?id=), which takes precedence over ?q=
+    pending_id = st.session_state.pop('pending_question_id', None)
+    if pending_id:
+        target_idx = store.index_of(pending_id)
+        if target_idx is not None:
+            st.session_state.current_index = position_in_order(target_idx, st.session_state.current_index)
+            st.query_params["q"] = str(st.session_state.current_index + 1)
     
-    # Init question order
-    if len(st.session_state.question_order) != total:
-        st.session_state.question_order = list(range(total))
+    # Mock exam mode replaces the practice view
+    if st.session_state.get('mock_exam') is not None:
+        render_page_header(header_title)
+        handle_mock_exam(store)
+        render_footer()
+        return
     
     # Render UI headers
     render_language_selector()  # Add language selector at the top
-    render_page_header()
+    render_exam_selector(get_bank_registry(), bank.code, switch_exam)
+    render_page_header(header_title)
     render_preserve_scroll()  # Preserve scroll position during rerun
     
+    # Study tools: search, service filter, mock exam launcher and progress stats
+    filter_col, stats_col = render_tools_panel()
+    restore_filter_widgets()
+    handle_filters(store, filter_col)
+    handle_review_launcher(store, stats_col)
+    handle_exam_launcher(store, stats_col)
+    ensure_answer_arrays(store)
+    
     # Check Drive Configuration
     if "GDRIVE_FOLDER_ID" not in st.secrets:
         st.warning("⚠️ **Lưu ý:** Bạn chưa cấu hình `GDRIVE_FOLDER_ID`. File cache đang được lưu trong bộ nhớ riêng của Bot (bạn sẽ không thấy trên Drive). Vui lòng thêm Folder ID vào Secrets.", icon="📂")
@@ -199,9 +625,19 @@ def main():
     # Get current question
     indices, idx_ptr, real_idx = get_current_question_index(questions)
     q = questions[real_idx]
+    ai_id = bank.cache_id(store.cache_ids[real_idx])  # Shared by near-duplicate questions, namespaced per exam
+    
+    # Count one view per visit to a question, not per rerun while on it
+    if st.session_state.get('viewed_ai_id') != ai_id:
+        st.session_state.viewed_ai_id = ai_id
+        get_access_counter().record(ai_id)
+    
+    # Keep the URL a stable permalink to this question
+    if st.query_params.get("id") != q['id']:
+        st.query_params["id"] = q['id']
     
     # Render question header
-    render_question_header(idx_ptr, len(indices))
+    render_question_header(idx_ptr, len(indices), q['id'])
     
     # Check if there's a pending AI request for this question
     pending_request = st.session_state.get('pending_ai_request')
@@ -213,37 +649,49 @@ def main():
         render_question_card(q["question"], q['is_multiselect'])
         
         # Render form (always visible)
-        theory_req, explain_req = render_question_form(q, localS, is_loading=False, loading_type=None)
+        theory_req, explain_req = render_question_form(store, q, localS, is_loading=False, loading_type=None)
         
         # Show loading message below buttons when loading
         if is_loading:
             ai_lang = st.session_state.get('language', 'vi')
+            get_access_counter().record(ai_id, AI_REQUEST_WEIGHT)
             
-            # Show loading message below buttons
+            # Show loading message below buttons (replaced by the queue position while waiting for a slot)
+            loading = st.empty()
             if pending_request == 'theory':
-                st.info("⏳ Loading Theory...")
+                loading.info("⏳ Loading Theory...")
             elif pending_request == 'explanation':
-                st.info("⏳ Analyzing...")
+                loading.info("⏳ Analyzing...")
+            on_wait = lambda position: loading.info(get_text(ai_lang, 'ai_queue_position').format(position=position))
             
             if pending_request == 'theory':
-                theory_cache_key = f"{q['id']}_{ai_lang}"
+                theory_cache_key = f"{ai_id}_{ai_lang}"
                 if theory_cache_key not in st.session_state.theories:
                     # Load AI content WITHOUT spinner to avoid dimming
                     start_time = time.time()
                     opts_text = "\n".join(q['options'])
-                    st.session_state.theories[theory_cache_key] = get_ai_theory(q['question'], opts_text, q['id'], ai_lang)
+                    theory = get_ai_theory(q['question'], opts_text, ai_id, ai_lang, on_wait=on_wait)
+                    if theory == BUSY_RESPONSE:
+                        st.session_state.ai_notice = theory  # Shown once and not kept, so the learner can retry
+                    else:
+                        st.session_state.theories[theory_cache_key] = theory
                     elapsed = time.time() - start_time
                     if elapsed < 1.0: time.sleep(1.0 - elapsed)
                 st.session_state.active_ai_section = 'theory'
                 
             elif pending_request == 'explanation':
-                explanation_cache_key = f"{q['id']}_{ai_lang}"
+                explanation_cache_key = f"{ai_id}_{ai_lang}"
                 if explanation_cache_key not in st.session_state.explanations:
                     # Load AI content WITHOUT spinner to avoid dimming
                     start_time = time.time()
                     opts_text = "\n".join(q['options'])
-                    explanation = get_ai_explanation(q['question'], opts_text, q['correct_answer'], q['id'], ai_lang)
-                    st.session_state.explanations[explanation_cache_key] = explanation
+                    explanation = get_ai_explanation(
+                        q['question'], opts_text, q['correct_answer'], ai_id, ai_lang, exam=bank.code, on_wait=on_wait
+                    )
+                    if explanation == BUSY_RESPONSE:
+                        st.session_state.ai_notice = explanation
+                    else:
+                        st.session_state.explanations[explanation_cache_key] = explanation
                     elapsed = time.time() - start_time
                     if elapsed < 1.0: time.sleep(1.0 - elapsed)
                 st.session_state.active_ai_section = 'explanation'
@@ -265,18 +713,24 @@ def main():
                 st.session_state.pending_ai_question_id = q['id']
                 st.rerun()
             
+            # Overloaded AI generation from the previous run
+            notice = st.session_state.pop('ai_notice', None)
+            if notice:
+                st.warning(notice)
+            
             # Display answer feedback
             ans = st.session_state.user_answers.get(q['id'])
             if ans:
                 render_answer_feedback(ans, q['correct_answer'])
+                handle_related(store, real_idx, idx_ptr)
             
             # Render auto-scroll script
             render_auto_scroll_script()
             
             # Get current language for cache keys
             lang = st.session_state.get('language', 'vi')
-            theory_cache_key = f"{q['id']}_{lang}"
-            explanation_cache_key = f"{q['id']}_{lang}"
+            theory_cache_key = f"{ai_id}_{lang}"
+            explanation_cache_key = f"{ai_id}_{lang}"
             
             # Only display one AI section at a time based on active_ai_section
             # Display AI explanation (only if active)
@@ -296,11 +750,22 @@ def main():
                     auto_scroll=False
                 )
     
+    # Progress stats (vectorized over the whole bank, after this run's submit)
+    answers = st.session_state.answer_bits
+    render_progress_stats(
+        store.answer_key.stats(answers, st.session_state.session_answered),
+        store.answer_key.tag_stats(answers),
+        stats_col
+    )
+    render_memory_usage(session_memory_usage(), stats_col)
+    
     # Navigation
-    handle_navigation(idx_ptr, len(indices), total)
+    handle_navigation(store, idx_ptr, len(indices), len(indices))
     
     # Render Footer
     render_footer()
 
 if __name__ == "__main__":
-    main()
+    init_metrics()
+    with metrics.span("rerun"):
+        run_main()
@@ -0,0 +1,73 @@
+import re
+from pathlib import Path
+
+
+DEFAULT_BANK = "SAA-C03"
+HEADER_SCAN_BYTES = 4096
+
+_HEADER_RE = re.compile(r'## Exam (.+?) topic \d+ question \d+ discussion')
+
+
+class ExamBank:
+    """One markdown question bank: where it lives and how to parse it.
+
+    Only the file header is read at discovery time; questions are parsed
+    by the caller on first use.
+    """
+
+    __slots__ = ("code", "title", "path", "meta_marker")
+
+    def __init__(self, code, title, path, meta_marker):
+        self.code = code
+        self.title = title
+        self.path = Path(path)
+        self.meta_marker = meta_marker  # Line that ends the per-question metadata block
+
+    def __repr__(self):
+        return f"ExamBank({self.code!r}, {str(self.path)!r})"
+
+    @property
+    def is_default(self):
+        return self.code == DEFAULT_BANK
+
+    @property
+    def storage_prefix(self):
+        """Browser Local Storage key prefix, e.g. "saa_c03"."""
+        return self.code.lower().replace('-', '_')
+
+    def cache_id(self, question_id):
+        """AI cache id for a question. The default bank keeps bare ids so existing cache entries stay valid."""
+        return question_id if self.is_default else f"{self.code}/{question_id}"
+
+    def progress_key(self, learner_id):
+        """Learner key for the server-side progress store, namespaced like cache_id()."""
+        return learner_id if self.is_default else f"{learner_id}/{self.code}"
+
+    def mtime(self):
+        return self.path.stat().st_mtime if self.path.exists() else 0
+
+
+def read_bank_header(path):
+    """ExamBank for a markdown file, or None if it is not an ExamTopics export."""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        head = f.read(HEADER_SCAN_BYTES)
+    match = _HEADER_RE.search(head)
+    if not match:
+        return None
+    title = match.group(1).strip()  # e.g. "AWS Certified Solutions Architect - Associate SAA-C03"
+    code = Path(path).stem.replace('_', '-').upper()
+    return ExamBank(code, title, path, f"[All {title}")
+
+
+def discover_banks(*directories):
+    """{exam code: ExamBank} for every bank file in the given directories."""
+    banks = {}
+    for directory in directories:
+        directory = Path(directory)
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.glob('*.md')):
+            bank = read_bank_header(path)
+            if bank is not None and bank.code not in banks:
+                banks[bank.code] = bank
+    return banks
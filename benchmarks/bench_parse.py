@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+from synthetic import ROOT, make_bank
+
+sys.path.insert(0, str(ROOT))
+from quiz_core.parser import parse_blocks, parse_parallel, SEPARATOR  # noqa: E402
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return result, best * 1000
+
+
+def bench(scale, worker_counts):
+    text = make_bank(scale)
+    serial, serial_ms = timed(lambda: parse_blocks(text.split(SEPARATOR)))
+    rows = [{"scale": scale, "mb": round(len(text) / 1e6, 1), "workers": "serial", "ms": round(serial_ms, 1), "speedup": 1.0}]
+    for workers in worker_counts:
+        parsed, ms = timed(lambda: parse_parallel(text, workers=workers))
+        assert parsed == serial, "parallel parse must match serial output"
+        rows.append({
+            "scale": scale,
+            "mb": round(len(text) / 1e6, 1),
+            "workers": workers,
+            "ms": round(ms, 1),
+            "speedup": round(serial_ms / ms, 2),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    # Always include 2 workers so pool overhead is visible even on a single core
+    worker_counts = sorted({w for w in (2, 4, 8, cores) if 1 < w <= max(cores, 2)})
+    print(f"cores: {cores}")
+    for scale in (1, 10):
+        for row in bench(scale, worker_counts):
+            print(row)
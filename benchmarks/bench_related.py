@@ -0,0 +1,33 @@
+import sys
+import time
+
+from synthetic import ROOT, make_bank
+
+sys.path.insert(0, str(ROOT))
+from parser_service import parse_markdown_file  # noqa: E402
+from search_service import tokenize_questions  # noqa: E402
+from similarity_service import RelatedIndex  # noqa: E402
+
+
+def bench(scale, repeat=10000):
+    questions = parse_markdown_file.__wrapped__(make_bank(scale))
+    documents = tokenize_questions(questions)
+    t = time.perf_counter()
+    index = RelatedIndex(documents)
+    build_ms = (time.perf_counter() - t) * 1000
+
+    t = time.perf_counter()
+    for i in range(repeat):
+        index.related(i % len(questions))
+    lookup_us = (time.perf_counter() - t) / repeat * 1e6
+    return {
+        "scale": scale,
+        "questions": len(questions),
+        "build_ms": round(build_ms, 1),
+        "lookup_us": round(lookup_us, 2),
+    }
+
+
+if __name__ == "__main__":
+    for scale in (1, 10):
+        print(bench(scale))
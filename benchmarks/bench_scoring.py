@@ -0,0 +1,34 @@
+import sys
+import time
+
+import numpy as np
+
+from synthetic import ROOT, make_bank
+
+sys.path.insert(0, str(ROOT))
+from parser_service import parse_markdown_file  # noqa: E402
+from question_store import QuestionStore  # noqa: E402
+
+
+def bench(scale, repeat=1000):
+    store = QuestionStore(parse_markdown_file.__wrapped__(make_bank(scale)))
+    key = store.answer_key
+    rng = np.random.RandomState(0)
+    answers = np.where(rng.rand(key.size) < 0.5, key.correct, rng.randint(0, 64, key.size)).astype(np.uint8)
+    session = rng.rand(key.size) < 0.1
+
+    t = time.perf_counter()
+    for _ in range(repeat):
+        key.stats(answers, session)
+    stats_us = (time.perf_counter() - t) / repeat * 1e6
+
+    t = time.perf_counter()
+    for _ in range(repeat):
+        key.tag_stats(answers)
+    tag_us = (time.perf_counter() - t) / repeat * 1e6
+    return {"scale": scale, "questions": key.size, "stats_us": round(stats_us, 1), "tag_stats_us": round(tag_us, 1)}
+
+
+if __name__ == "__main__":
+    for scale in (1, 10):
+        print(bench(scale))
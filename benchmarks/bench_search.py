@@ -0,0 +1,43 @@
+import statistics
+import sys
+import time
+
+from synthetic import ROOT, make_bank
+
+sys.path.insert(0, str(ROOT))
+from parser_service import parse_markdown_file  # noqa: E402
+from search_service import SearchIndex, tokenize_questions  # noqa: E402
+
+QUERIES = [
+    "dynamo", "dynamodb dax", "kines", "route 53 failover", "aurora read replica",
+    "s3 glacier lifecycle", "least operational overhead", "lambda api gateway",
+    "vpc endpoint", "cloudfront", "efs", "sqs fifo",
+]
+
+
+def bench(scale, repeat=20):
+    questions = parse_markdown_file.__wrapped__(make_bank(scale))
+    t = time.perf_counter()
+    index = SearchIndex(tokenize_questions(questions))
+    build_ms = (time.perf_counter() - t) * 1000
+
+    timings = []
+    for _ in range(repeat):
+        for q in QUERIES:
+            t = time.perf_counter()
+            index.search(q)
+            timings.append((time.perf_counter() - t) * 1000)
+    timings.sort()
+    return {
+        "scale": scale,
+        "questions": len(questions),
+        "build_ms": round(build_ms, 1),
+        "query_p50_ms": round(statistics.median(timings), 3),
+        "query_p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "query_max_ms": round(timings[-1], 3),
+    }
+
+
+if __name__ == "__main__":
+    for scale in (1, 10):
+        print(bench(scale))
@@ -0,0 +1,260 @@
+"""Benchmark suite: parser, load_data, AI cache, renderers and full app reruns, written as JSON.
+
+    python benchmarks/bench_suite.py                      # 1x and 10x banks
+    python benchmarks/bench_suite.py --scales 1,10,100    # add the 100x bank (slow)
+    python benchmarks/bench_suite.py --compare base.json new.json
+
+Results go to benchmarks/results/<commit>.json. --compare prints the change of
+every timing present in both files and exits 1 when one is slower than
+--threshold (default 20%).
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import ROOT, make_explanation, write_bank
+
+sys.path.insert(0, str(ROOT))
+logging.disable(logging.WARNING)  # Bare-mode Streamlit calls warn on every use
+
+RESULTS_DIR = Path(__file__).parent / "results"
+CACHE_ENTRY = "x" * 2500  # Typical explanation length in characters
+MIN_DELTA_MS = 0.05  # Smaller absolute changes are timer noise, whatever the ratio
+
+RENDER_REPEAT = 20  # Renderer sets per AppTest run, to average out per-run overhead
+
+# Renders a question with the explanation and theory panels open, timing only the renderer calls
+RENDER_SCRIPT = f"""
+import time
+import streamlit as st
+from ui_components import render_ai_explanation, render_ai_theory, render_question_card
+
+start = time.perf_counter()
+for _ in range({RENDER_REPEAT}):
+    render_question_card(st.session_state.question)
+    render_ai_explanation("1", st.session_state.explanation)
+    render_ai_theory("1", st.session_state.explanation)
+st.session_state.render_ms = (time.perf_counter() - start) * 1000 / {RENDER_REPEAT}
+"""
+
+
+def timings(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return {"ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)}
+
+
+def bench_parse(bank):
+    from parser_service import parse_markdown_file
+    text = bank.path.read_text(encoding='utf-8')
+    result = timings(lambda: parse_markdown_file.__wrapped__(text, bank.meta_marker), repeat=3)
+    result["mb"] = round(len(text) / 1e6, 1)
+    return result
+
+
+def bench_load_data(bank):
+    """app.load_data cold (read + parse) and warm (st.cache_data hit, which unpickles a copy)."""
+    import app
+    from parser_service import parse_markdown_file
+
+    def cold():
+        app.load_data.clear()
+        parse_markdown_file.clear()
+        app.load_data(str(bank.path), bank.meta_marker, bank.mtime())
+
+    warm = lambda: app.load_data(str(bank.path), bank.meta_marker, bank.mtime())
+    cold_result = timings(cold, repeat=3)
+    return {"cold": cold_result, "warm": timings(warm, repeat=10)}
+
+
+def bench_cache(entries, directory):
+    """ContentCache over the local JSON backend, which get/save_cached_content delegate to."""
+    from quiz_core import ContentCache, JsonFileCache
+    path = Path(directory) / f"cache_{entries}.json"
+    data = {"explanations": {f"{i}_vi": CACHE_ENTRY for i in range(entries)}, "theories": {}}
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    cache = ContentCache(JsonFileCache(path))
+    cache.get("explanations", "0_vi")  # Load once; later gets use the mtime-checked copy
+    added = iter(range(entries, entries + 1000))
+    return {
+        "get_cold": timings(lambda: ContentCache(JsonFileCache(path)).get("explanations", "0_vi"), repeat=3),
+        "get_hit": timings(lambda: cache.get("explanations", f"{entries // 2}_vi"), repeat=200),
+        "get_miss": timings(lambda: cache.get("theories", "0_vi"), repeat=200),
+        "save": timings(lambda: cache.set("explanations", f"{next(added)}_vi", CACHE_ENTRY), repeat=5),
+        "mb": round(path.stat().st_size / 1e6, 1),
+    }
+
+
+def bench_render(reruns):
+    """Renderer time per rerun on a page with a heavy explanation and theory open.
+
+    "first" includes rendering into the shared render cache; "rerun" is later reruns of the same content.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from synthetic import load_bank_text
+
+    st.cache_resource.clear()
+    at = AppTest.from_string(RENDER_SCRIPT, default_timeout=600)
+    at.secrets["GDRIVE_FOLDER_ID"] = ""
+    at.session_state["question"] = load_bank_text()[:1200]
+    at.session_state["explanation"] = make_explanation()
+
+    def sample():
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return at.session_state["render_ms"]
+
+    first = sample()
+    samples = [sample() for _ in range(reruns)]
+    return {
+        "first": {"ms": round(first, 3)},
+        "rerun": {"ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)},
+        "kb": round(len(make_explanation()) / 1000, 1),
+    }
+
+
+def bench_reruns(bank, reruns, db_path):
+    """Full script reruns through AppTest: first load, idle rerun, Next and Submit."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from translations import get_text
+
+    os.environ["PROGRESS_BACKEND"] = "sqlite"
+    os.environ["PROGRESS_DB_PATH"] = str(db_path)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=600)
+    at.secrets["GDRIVE_FOLDER_ID"] = ""  # No Drive warning; also provides secrets without a secrets.toml
+    at.query_params["u"] = "bench"
+    at.query_params["exam"] = bank.code
+
+    def check():
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    first = timings(lambda: at.run(), repeat=1)
+    check()
+    idle = timings(lambda: at.run(), repeat=reruns)
+
+    def click(label_key):
+        label = get_text('en', label_key)  # The question form and navigation are always in English
+        next(b for b in at.button if b.label == label).click().run()
+
+    def next_question():
+        click('btn_next')
+
+    def submit():
+        if at.radio:  # Multi-select questions are submitted empty, which still reruns
+            at.radio[0].set_value(at.radio[0].options[0])
+        click('btn_submit')
+
+    nav = timings(next_question, repeat=reruns)
+    check()
+    answer = timings(lambda: (submit(), next_question()), repeat=reruns)
+    check()
+    return {"first": first, "idle": idle, "next": nav, "submit_next": answer}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results, prefix=""):
+    """{"parse/1x": {"ms": ...}} -> {"parse/1x.ms": ...} for comparison."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif key.endswith("ms"):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(base_path, new_path, threshold):
+    base = flatten(json.loads(Path(base_path).read_text())["results"])
+    new = flatten(json.loads(Path(new_path).read_text())["results"])
+    regressions = []
+    for key in sorted(base.keys() & new.keys()):
+        if not key.endswith(".ms") or not base[key]:
+            continue  # Best-of timings only; medians are noisier
+        change = new[key] / base[key] - 1
+        flag = "  REGRESSION" if change > threshold and new[key] - base[key] > MIN_DELTA_MS else ""
+        print(f"{key:40} {base[key]:10.3f} -> {new[key]:10.3f} ms  {change:+7.1%}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10", help="Bank sizes relative to SAA_C03.md, e.g. 1,10,100")
+    parser.add_argument("--cache-sizes", default="100,1000,10000", help="AI cache entries to benchmark")
+    parser.add_argument("--reruns", type=int, default=10, help="AppTest reruns per measured interaction")
+    parser.add_argument("--skip-reruns", action="store_true", help="Skip the AppTest rerun benchmarks")
+    parser.add_argument("--output", help="Result file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    output = Path(args.output).resolve() if args.output else None
+    workdir = Path(tempfile.mkdtemp(prefix="quiz-bench-"))
+    # Streamlit looks for .streamlit/secrets.toml in the working directory
+    (workdir / ".streamlit").mkdir()
+    (workdir / ".streamlit" / "secrets.toml").write_text('GDRIVE_FOLDER_ID = ""\n')
+    os.chdir(workdir)
+    os.environ["BANK_DIR"] = str(workdir)
+
+    from bank_registry import read_bank_header
+    results = {}
+    for scale in [int(s) for s in args.scales.split(",") if s]:
+        bank = read_bank_header(write_bank(workdir, scale))
+        print(f"{bank.code}: parse, load_data" + ("" if args.skip_reruns else ", reruns"), flush=True)
+        results[f"parse/{scale}x"] = bench_parse(bank)
+        results[f"load_data/{scale}x"] = bench_load_data(bank)
+        if not args.skip_reruns:
+            results[f"rerun/{scale}x"] = bench_reruns(bank, args.reruns, workdir / f"progress_{scale}.db")
+    for entries in [int(s) for s in args.cache_sizes.split(",") if s]:
+        print(f"cache: {entries} entries", flush=True)
+        results[f"cache/{entries}"] = bench_cache(entries, workdir)
+    print("render: question card, explanation and theory", flush=True)
+    results["render"] = bench_render(args.reruns)
+
+    report = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    output = output or RESULTS_DIR / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for key, value in flatten(results).items():
+        print(f"{key:40} {value:10.3f}")
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
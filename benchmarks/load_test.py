@@ -0,0 +1,358 @@
+"""Concurrent-session load test of the app against in-process Gemini and Drive stand-ins.
+
+    python benchmarks/load_test.py --sessions 20 --actions 30
+    python benchmarks/load_test.py --gemini-429 0.3 --keys 2 --json load.json
+
+Each simulated learner is an AppTest session on its own thread, so reruns
+share the process, caches and GIL the way Streamlit sessions do (AppTest
+normally swaps a mock runtime in and out per run, which breaks overlapping
+runs; SharedRuntimeAppTest installs it once instead). Sessions
+navigate, answer and open explanations/theories. google.generativeai is
+replaced by a fake that streams after a configurable delay and raises 429s
+at a configurable rate per key; the AI cache backend is replaced by an
+in-memory "Drive" with list/download/upload latency and its own 429 rate.
+Reports throughput, p50/p95/p99 rerun latency per action, CPU and RSS.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from collections import deque
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from urllib import parse
+
+from synthetic import ROOT
+
+sys.path.insert(0, str(ROOT))
+logging.disable(logging.WARNING)  # Bare-mode Streamlit calls warn on every use
+
+ACTIONS = ("next", "answer", "explanation", "theory", "idle")
+WEIGHTS = (40, 30, 12, 8, 10)
+
+
+class FakeGemini:
+    """Stand-in for google.generativeai: configure() and GenerativeModel(...).generate_content(stream=True)."""
+
+    def __init__(self, latency, chunks, rate_429, rng, rpm=0):
+        self.latency = latency  # Seconds until the first chunk; the rest stream over the same time again
+        self.chunks = chunks
+        self.rate_429 = rate_429
+        self.rpm = rpm  # Per-key requests per minute before 429s, like a real quota (0 = unlimited)
+        self.recent = {}  # key -> deque of call times in the last minute
+        self.rng = rng
+        self.current_key = None
+        self.calls = 0
+        self.rate_limited = 0
+        self.keys_used = {}
+        self._lock = threading.Lock()
+
+    def configure(self, api_key=None, **kwargs):
+        self.current_key = api_key
+
+    def GenerativeModel(self, model_name):
+        return SimpleNamespace(generate_content=self.generate_content)
+
+    def generate_content(self, prompt, stream=True):
+        with self._lock:
+            self.calls += 1
+            self.keys_used[self.current_key] = self.keys_used.get(self.current_key, 0) + 1
+            limited = self.rng.random() < self.rate_429
+            if self.rpm:
+                now = time.monotonic()
+                calls = self.recent.setdefault(self.current_key, deque())
+                while calls and calls[0] < now - 60:
+                    calls.popleft()
+                limited = limited or len(calls) >= self.rpm
+                calls.append(now)
+            if limited:
+                self.rate_limited += 1
+        time.sleep(self.latency)
+        if limited:
+            raise Exception("429 Resource has been exhausted (e.g. check quota).")
+        return self._stream(len(prompt))
+
+    def _stream(self, prompt_chars):
+        for i in range(self.chunks):
+            if i:
+                time.sleep(self.latency / self.chunks)
+            part = f"Chunk {i} of a {prompt_chars}-char prompt. " * 20
+            # Running token totals like Gemini's usage_metadata, at roughly 4 characters a token
+            usage = SimpleNamespace(prompt_token_count=prompt_chars // 4, candidates_token_count=(i + 1) * len(part) // 4)
+            yield SimpleNamespace(
+                text=part, candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))], usage_metadata=usage
+            )
+
+
+class FakeDrive:
+    """In-memory AI cache backend with Drive-like latency: load = list + download, save = list + upload."""
+
+    def __init__(self, latency, rate_429, rng):
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.rng = rng
+        self.data = {"explanations": {}, "theories": {}}
+        self.loads = 0
+        self.saves = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def _request(self):
+        time.sleep(self.latency)
+        with self._lock:
+            if self.rng.random() < self.rate_429:
+                self.rate_limited += 1
+                raise Exception("<HttpError 429 \"User rate limit exceeded.\">")
+
+    def load(self):
+        self._request()
+        self._request()
+        with self._lock:
+            self.loads += 1
+            return json.loads(json.dumps(self.data))  # A fresh document, like a download
+
+    def save(self, data):
+        self._request()
+        self._request()
+        with self._lock:
+            self.saves += 1
+            self.data = json.loads(json.dumps(data))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / 1e6
+
+
+def install_shared_runtime():
+    """The mock Runtime and config AppTest sets up per run, installed once for all sessions."""
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit import config
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    config.set_option("global.appTest", True)
+
+
+def shared_runtime_app_test():
+    from streamlit.runtime.pages_manager import PagesManager
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    script_cache = ScriptCache()  # One compiled app.py, as on a server; concurrent compile() can fail on 3.11
+
+    class SharedRuntimeAppTest(AppTest):
+        """AppTest whose runs may overlap: same steps as AppTest._run minus the global setup and teardown."""
+
+        def _run(self, widget_state=None, timeout=None):
+            pages_manager = PagesManager(self._script_path, script_cache, setup_watcher=False)
+            runner = LocalScriptRunner(self._script_path, self.session_state, pages_manager, args=self.args, kwargs=self.kwargs)
+            runner._script_cache = script_cache
+            self._tree = runner.run(widget_state, self.query_params, timeout or self.default_timeout, self._page_hash)
+            self._tree._runner = self
+            self.query_params = parse.parse_qs(runner.event_data[-1]["client_state"].query_string)
+            return self
+
+    return SharedRuntimeAppTest
+
+
+class Session(threading.Thread):
+    """One learner: a fixed number of weighted random actions, each timed as one interaction."""
+
+    def __init__(self, number, args, app_test, total_questions):
+        super().__init__(name=f"learner-{number}", daemon=True)
+        self.number = number
+        self.args = args
+        self.app_test = app_test
+        self.total_questions = total_questions
+        self.rng = random.Random(args.seed + number)
+        self.samples = []  # (action, seconds)
+        self.errors = []
+
+    def run(self):
+        from translations import get_text
+
+        at = self.app_test(str(ROOT / "app.py"), default_timeout=self.args.timeout)
+        at.query_params["u"] = f"load{self.number}"
+        at.query_params["q"] = str(self.rng.randint(1, self.total_questions))
+
+        def click(label_key):
+            label = get_text('en', label_key)  # The question form and navigation are always in English
+            button = next((b for b in at.button if b.label == label), None)
+            if button is None:
+                return at.run()
+            return button.click().run()
+
+        def act(action):
+            if action == "next":
+                click('btn_next')
+            elif action == "answer":
+                if at.radio:
+                    at.radio[0].set_value(self.rng.choice(at.radio[0].options))
+                click('btn_submit')
+            elif action == "explanation":
+                click('btn_explain')
+                at.run()  # The pending request is served on the following rerun
+            elif action == "theory":
+                click('btn_theory')
+                at.run()
+            else:
+                at.run()
+
+        try:
+            self.timed("first", at.run)
+            for _ in range(self.args.actions):
+                action = self.rng.choices(ACTIONS, WEIGHTS)[0]
+                self.timed(action, lambda: act(action))
+                if at.exception:
+                    self.errors.append(at.exception[0].message)
+                    break
+                if self.args.think:
+                    time.sleep(self.rng.uniform(0, 2 * self.args.think))
+        except Exception as e:
+            self.errors.append(repr(e))
+
+    def timed(self, action, fn):
+        start = time.perf_counter()
+        fn()
+        self.samples.append((action, time.perf_counter() - start))
+
+
+def summarize(samples):
+    values = sorted(seconds * 1000 for _, seconds in samples)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50), 1),
+        "p95_ms": round(percentile(values, 0.95), 1),
+        "p99_ms": round(percentile(values, 0.99), 1),
+        "mean_ms": round(statistics.fmean(values), 1) if values else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent simulated learners")
+    parser.add_argument("--actions", type=int, default=20, help="Interactions per learner")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean think time between interactions (s)")
+    parser.add_argument("--keys", type=int, default=3, help="Fake Gemini API keys")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="Seconds to first chunk")
+    parser.add_argument("--gemini-chunks", type=int, default=8)
+    parser.add_argument("--gemini-429", type=float, default=0.1, help="Probability a Gemini call is rate limited")
+    parser.add_argument("--gemini-rpm", type=int, default=0, help="Per-key requests per minute before 429s (0 = no quota)")
+    parser.add_argument("--drive-latency", type=float, default=0.05, help="Seconds per Drive request")
+    parser.add_argument("--drive-429", type=float, default=0.0, help="Probability a Drive request is rate limited")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before one rerun is abandoned")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    output = Path(args.json).resolve() if args.json else None
+    workdir = Path(tempfile.mkdtemp(prefix="quiz-load-"))
+    secrets = {
+        "GOOGLE_API_KEYS": ",".join(f"fake-key-{i}" for i in range(args.keys)),
+        "GDRIVE_FOLDER_ID": "fake-folder",
+    }
+    # Secrets come from this file for every session, including ai_service's keys read at import
+    (workdir / ".streamlit").mkdir()
+    (workdir / ".streamlit" / "secrets.toml").write_text("".join(f'{k} = "{v}"\n' for k, v in secrets.items()))
+    os.chdir(workdir)
+    os.environ["PROGRESS_BACKEND"] = "sqlite"
+    os.environ["PROGRESS_DB_PATH"] = str(workdir / "progress.db")
+    os.environ["METRICS_ENABLED"] = "1"  # Gemini outcome and cache hit counters for the report
+    os.environ["AI_USAGE_PATH"] = str(workdir / "ai_usage.json")
+    os.environ["ACCESS_COUNTS_PATH"] = str(workdir / "access_counts.json")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)  # Deprecation notice of the SDK being faked
+        import google.generativeai as genai
+    import ai_service
+    from bank_registry import read_bank_header
+    from parser_service import parse_markdown_file
+    from quiz_core import metrics
+
+    rng = random.Random(args.seed)
+    gemini = FakeGemini(args.gemini_latency, args.gemini_chunks, args.gemini_429, rng, args.gemini_rpm)
+    drive = FakeDrive(args.drive_latency, args.drive_429, random.Random(args.seed + 1))
+    genai.configure = gemini.configure
+    genai.GenerativeModel = gemini.GenerativeModel
+    ai_service.cache_backend_from_config = lambda config, local_path, on_warning=print: drive
+
+    bank = read_bank_header(ROOT / "SAA_C03.md")
+    total_questions = len(parse_markdown_file.__wrapped__(bank.path.read_text(encoding='utf-8'), bank.meta_marker))
+
+    install_shared_runtime()
+    app_test = shared_runtime_app_test()
+    sessions = [Session(i, args, app_test, total_questions) for i in range(args.sessions)]
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    wall = time.perf_counter() - start
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+
+    samples = [s for session in sessions for s in session.samples]
+    interactions = [s for s in samples if s[0] != "first"]
+    cpu = (usage_end.ru_utime - usage_start.ru_utime) + (usage_end.ru_stime - usage_start.ru_stime)
+    report = {
+        "config": vars(args),
+        "wall_s": round(wall, 1),
+        "interactions": len(interactions),
+        "throughput_per_s": round(len(interactions) / wall, 2),
+        "latency": summarize(interactions),
+        "by_action": {a: summarize([s for s in samples if s[0] == a]) for a in ("first",) + ACTIONS},
+        "cpu_s": round(cpu, 1),
+        "cpu_utilization": round(cpu / wall, 2),
+        "rss_mb": round(current_rss_mb(), 1),
+        "max_rss_mb": round(usage_end.ru_maxrss * 1024 / 1e6, 1),  # ru_maxrss is KiB on Linux
+        "gemini": {"calls": gemini.calls, "rate_limited": gemini.rate_limited, "by_key": gemini.keys_used},
+        "drive": {"loads": drive.loads, "saves": drive.saves, "rate_limited": drive.rate_limited},
+        "outcomes": {
+            f"{name}{dict(labels)}": value for (name, labels), value in sorted(metrics.REGISTRY.counters.items())
+        },
+        "errors": [e for session in sessions for e in session.errors],
+    }
+
+    print(f"{args.sessions} sessions x {args.actions} actions in {report['wall_s']}s: "
+          f"{report['throughput_per_s']} interactions/s, CPU {report['cpu_utilization']:.0%}, "
+          f"RSS {report['rss_mb']} MB (peak {report['max_rss_mb']} MB)")
+    for action, stats in report["by_action"].items():
+        if stats["count"]:
+            print(f"  {action:12} n={stats['count']:4}  p50 {stats['p50_ms']:8.1f}  p95 {stats['p95_ms']:8.1f}  p99 {stats['p99_ms']:8.1f} ms")
+    print(f"  gemini: {report['gemini']}")
+    print(f"  drive:  {report['drive']}")
+    for name, value in report["outcomes"].items():
+        print(f"  {name}: {value}")
+    if report["errors"]:
+        print(f"  errors: {len(report['errors'])}, first: {report['errors'][0][:200]}")
+    if output:
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SEPARATOR = '----------------------------------------'
+ID_RE = re.compile(r'(question |Question #: )(\d+)')
+
+
+def load_bank_text():
+    return (ROOT / "SAA_C03.md").read_text(encoding='utf-8')
+
+
+def make_bank(scale=1, base_text=None):
+    """Synthetic bank `scale` times the size of SAA_C03.md.
+
+    Copies of the real blocks get fresh question ids so every block stays
+    unique for id-based indexes.
+    """
+    text = base_text if base_text is not None else load_bank_text()
+    blocks = [b for b in text.split(SEPARATOR) if b.strip()]
+    out = []
+    for copy in range(scale):
+        offset = copy * 100000
+        for block in blocks:
+            if offset:
+                block = ID_RE.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + offset}", block)
+            out.append(block)
+    return SEPARATOR.join(out)
+
+
+def write_bank(directory, scale):
+    """Write make_bank(scale) as BENCH_<scale>X.md (exam code BENCH-<scale>X) and return its path."""
+    path = Path(directory) / f"BENCH_{scale}X.md"
+    if not path.exists():
+        path.write_text(make_bank(scale), encoding='utf-8')
+    return path
+
+
+def make_explanation(sections=6, bullets=5):
+    """AI-style Markdown explanation (~9 KB by default): headings, bold/code bullets, links and a table per section."""
+    words = ["Amazon", "EC2", "subnet", "latency", "replication", "*durable*", "`IAM`", "policy", "cross-region",
+             "[docs](https://docs.aws.amazon.com)", "**S3**", "throughput"]
+    parts = []
+    for s in range(sections):
+        parts.append(f"### {s + 1}. Why option {'ABCD'[s % 4]} fits **Amazon S3** and `VPC` endpoints\n")
+        for b in range(bullets):
+            parts.append(f"- **Point {b}**: " + " ".join(words[(s * 7 + b * 3 + i) % len(words)] for i in range(25)))
+        parts.append("\n| Service | Use |\n|---|---|\n| S3 | objects |\n| EBS | blocks |\n")
+    return "\n".join(parts)
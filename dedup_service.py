@@ -0,0 +1,152 @@
+import argparse
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from search_service import tokenize_questions
+
+
+# 128 hash functions split into 16 bands of 8 rows: pairs above ~0.7
+# Jaccard similarity almost always share a band bucket.
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, _PRIME, size=(NUM_PERM, 1)).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=(NUM_PERM, 1)).astype(np.uint64)
+
+
+def shingles(tokens, size=SHINGLE_SIZE):
+    """Hashed word n-grams of a token list (stable across processes)."""
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return np.fromiter((zlib.crc32(g.encode()) for g in set(grams)), dtype=np.uint64)
+
+
+def minhash(hashes):
+    """MinHash signature of a shingle hash array."""
+    return ((_A * (hashes % _PRIME) + _B) % _PRIME).min(axis=1)
+
+
+def find_duplicate_clusters(questions, threshold=DEFAULT_THRESHOLD, documents=None):
+    """Group near-duplicate questions with MinHash LSH.
+
+    Returns a list of clusters (sorted lists of question indices, size >= 2).
+    Only pairs that share an LSH band bucket are compared, so the cost grows
+    with the number of real candidates rather than n^2.
+    """
+    if documents is None:
+        documents = tokenize_questions(questions)
+
+    rows = NUM_PERM // BANDS
+    signatures = {}
+    buckets = {}
+    for doc, tokens in enumerate(documents):
+        hashes = shingles(tokens)
+        if not len(hashes):
+            continue
+        sig = minhash(hashes)
+        signatures[doc] = sig
+        for band in range(BANDS):
+            key = (band, sig[band * rows:(band + 1) * rows].tobytes())
+            buckets.setdefault(key, []).append(doc)
+
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if np.mean(signatures[a] == signatures[b]) >= threshold:
+                    ra, rb = find(a), find(b)
+                    if ra != rb:
+                        parent[max(ra, rb)] = min(ra, rb)
+
+    clusters = {}
+    for doc in parent:
+        clusters.setdefault(find(doc), set()).add(doc)
+    return sorted(sorted(c) for c in clusters.values() if len(c) > 1)
+
+
+def _answer_signature(q):
+    return (q['correct_answer'], tuple(opt.strip().lower() for opt in q['options']))
+
+
+def canonical_ids(questions, clusters):
+    """Question id to use for shared AI cache entries, per question index.
+
+    Members of a cluster share the id of the lowest-numbered member, but only
+    when their options and correct answer are identical; otherwise an
+    explanation for one would reference the wrong letters for the other.
+    """
+    ids = [q['id'] for q in questions]
+    for cluster in clusters:
+        by_answer = {}
+        for idx in cluster:
+            by_answer.setdefault(_answer_signature(questions[idx]), []).append(idx)
+        for group in by_answer.values():
+            canonical = min((questions[i]['id'] for i in group), key=int)
+            for idx in group:
+                ids[idx] = canonical
+    return ids
+
+
+def build_report(questions, clusters):
+    """JSON-serializable description of duplicate clusters."""
+    documents = tokenize_questions(questions)
+    report = []
+    for cluster in clusters:
+        sigs = [minhash(shingles(documents[i])) for i in cluster]
+        similarity = min(float(np.mean(sigs[0] == s)) for s in sigs[1:])
+        report.append({
+            "ids": [questions[i]['id'] for i in cluster],
+            "positions": [i + 1 for i in cluster],
+            "min_similarity": round(similarity, 3),
+            "answers": [questions[i]['correct_answer'] for i in cluster],
+            "preview": questions[cluster[0]]['question'][:120],
+        })
+    return report
+
+
+def main():
+    from quiz_core.parser import parse_questions
+
+    parser = argparse.ArgumentParser(description="Report near-duplicate questions in a Markdown bank.")
+    parser.add_argument("bank", nargs="?", default=str(Path(__file__).parent / "SAA_C03.md"))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    questions = parse_questions(Path(args.bank).read_text(encoding='utf-8'))
+    clusters = find_duplicate_clusters(questions, args.threshold)
+    report = build_report(questions, clusters)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    for entry in report:
+        print(f"#{', #'.join(entry['ids'])}  (similarity >= {entry['min_similarity']}, answers {entry['answers']})")
+        print(f"    {entry['preview']}")
+    print(f"{len(report)} clusters, {sum(len(e['ids']) for e in report)} questions")
+
+
+if __name__ == "__main__":
+    main()
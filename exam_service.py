@@ -0,0 +1,93 @@
+import random
+import time
+from array import array
+
+import numpy as np
+
+from scoring_service import answer_mask
+
+
+EXAM_QUESTIONS = 65
+EXAM_MINUTES = 130
+PASSING_SCORE = 720  # SAA-C03 scaled score, 100-1000
+
+# Bit counts for 6-bit answer masks (A-F)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class MockExam:
+    """One exam attempt in a compact form that is cheap to keep in session state.
+
+    Question indices and answer bitmasks are fixed-size arrays; feedback is
+    deferred until grade() scores the whole attempt in one pass.
+    """
+
+    __slots__ = ("seed", "questions", "answers", "started_at", "deadline", "position", "result")
+
+    def __init__(self, total, seed=None, size=EXAM_QUESTIONS, minutes=EXAM_MINUTES, now=None):
+        if seed is None:
+            seed = random.randrange(1 << 31)
+        now = time.time() if now is None else now
+        self.seed = seed
+        # Same seed + bank size -> same question set, so attempts are reproducible
+        self.questions = array('I', random.Random(seed).sample(range(total), min(size, total)))
+        self.answers = bytearray(len(self.questions))
+        self.started_at = now
+        self.deadline = now + minutes * 60
+        self.position = 0
+        self.result = None
+
+    def __len__(self):
+        return len(self.questions)
+
+    def remaining(self, now=None):
+        """Seconds left on the server-side clock."""
+        return max(0.0, self.deadline - (time.time() if now is None else now))
+
+    def expired(self, now=None):
+        return self.remaining(now) <= 0
+
+    @property
+    def finished(self):
+        return self.result is not None
+
+    def answer(self, position, letters):
+        if not self.finished:
+            self.answers[position] = answer_mask(letters)
+
+    def answered_count(self):
+        return len(self.answers) - self.answers.count(0)
+
+    def grade(self, answer_key, partial_credit=True):
+        """Score every answer at once and store the result on the exam."""
+        picks = np.frombuffer(self.questions, dtype=np.uint32)
+        user = np.frombuffer(bytes(self.answers), dtype=np.uint8)
+        key = answer_key.correct[picks]
+        expected = answer_key.expected[picks]
+
+        exact = (user == key) & (key != 0)
+        credit = exact.astype(np.float32)
+        if partial_credit:
+            # Multi-select: one point per correct pick, minus one per wrong pick,
+            # nothing if more options were chosen than the question asks for.
+            multi = expected > 1
+            hits = _POPCOUNT[user & key].astype(np.float32)
+            wrong = _POPCOUNT[user & ~key].astype(np.float32)
+            over = _POPCOUNT[user] > expected
+            partial = np.clip(hits - wrong, 0, None) / np.maximum(expected, 1)
+            credit = np.where(multi & ~over, partial, credit)
+
+        n = len(picks)
+        raw = float(credit.sum())
+        scaled = int(round(100 + 900 * raw / n)) if n else 100
+        self.result = {
+            "scaled_score": scaled,
+            "passed": scaled >= PASSING_SCORE,
+            "raw_score": round(raw, 2),
+            "correct": int(np.count_nonzero(exact)),
+            "answered": int(np.count_nonzero(user)),
+            "total": n,
+            "credit": credit.round(3).tolist(),
+            "duration": round(min(time.time(), self.deadline) - self.started_at),
+        }
+        return self.result
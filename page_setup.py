@@ -1,34 +1,48 @@
+import json
+
 import streamlit as st
 # Force refresh for Streamlit Cloud - 2026-01-15
 
 
-def setup_page_config():
-    """Configure Streamlit page settings and SEO."""
+DEFAULT_TITLE = "AWS Certified Solutions Architect Associate (SAA-C03)"
+
+
+def setup_page_config(exam_title=None):
+    """Configure Streamlit page settings and SEO. `exam_title` names a bank other than the default."""
     # Early Page Config for faster initial render
     st.write('<style>div.block-container{padding-top:0rem;}</style>', unsafe_allow_html=True)
     st.set_page_config(
-        page_title="AWS Certified Solutions Architect Associate (SAA-C03)", 
+        page_title=exam_title or DEFAULT_TITLE, 
         page_icon="☁️", 
         layout="wide", 
         initial_sidebar_state="collapsed"
     )
 
-def inject_seo():
-    """Inject SEO meta tags."""
-    st.markdown("""
+def inject_seo(exam_title=None):
+    """Inject SEO meta tags for the selected exam."""
+    title = json.dumps(exam_title or DEFAULT_TITLE)  # Bank titles come from the files: quote them for JS
+    description = json.dumps(
+        f"Luyện thi chứng chỉ {exam_title or DEFAULT_TITLE} miễn phí với bộ câu hỏi trắc nghiệm đầy đủ, "
+        "giải thích chi tiết từ AI và chế độ ôn tập thông minh."
+    )
+    keywords = json.dumps(
+        f"AWS, {exam_title}, Exam Prep, Trắc nghiệm AWS, Cloud Computing, Luyện thi AWS miễn phí" if exam_title else
+        "AWS, SAA-C03, Solutions Architect, Exam Prep, Trắc nghiệm AWS, Cloud Computing, Luyện thi AWS miễn phí"
+    )
+    st.markdown(f"""
         <script>
-            document.title = "AWS Certified Solutions Architect Associate (SAA-C03)";
+            document.title = {title};
             
             // Add Meta Description
             var metaDesc = document.createElement('meta');
             metaDesc.name = "description";
-            metaDesc.content = "Luyện thi chứng chỉ AWS Certified Solutions Architect Associate (SAA-C03) miễn phí với bộ câu hỏi trắc nghiệm đầy đủ, giải thích chi tiết từ AI và chế độ ôn tập thông minh.";
+            metaDesc.content = {description};
             document.getElementsByTagName('head')[0].appendChild(metaDesc);
 
             // Add Meta Keywords
             var metaKeywords = document.createElement('meta');
             metaKeywords.name = "keywords";
-            metaKeywords.content = "AWS, SAA-C03, Solutions Architect, Exam Prep, Trắc nghiệm AWS, Cloud Computing, Luyện thi AWS miễn phí";
+            metaKeywords.content = {keywords};
             document.getElementsByTagName('head')[0].appendChild(metaKeywords);
         </script>
     """, unsafe_allow_html=True)
@@ -0,0 +1,187 @@
+import abc
+import atexit
+import json
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    learner_id  TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    answer      TEXT NOT NULL,
+    answered_at REAL NOT NULL,
+    PRIMARY KEY (learner_id, question_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_answers_learner_time ON answers (learner_id, answered_at);
+
+CREATE TABLE IF NOT EXISTS learner_state (
+    learner_id TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (learner_id, key)
+) WITHOUT ROWID;
+"""
+
+
+def new_learner_id():
+    """Generate an anonymous learner token (safe for URL query params)."""
+    return secrets.token_urlsafe(12)
+
+
+class ProgressStore(abc.ABC):
+    """Interface for server-side progress backends.
+
+    Answers are keyed by (learner_id, question_id). Arbitrary per-learner
+    state (e.g. scheduler data) is stored as JSON strings keyed by name.
+    """
+
+    @abc.abstractmethod
+    def load(self, learner_id):
+        """Return {"answers": {...}, "state": {...}} for a learner in one read."""
+
+    @abc.abstractmethod
+    def record_answer(self, learner_id, question_id, answer):
+        """Queue an answer write."""
+
+    @abc.abstractmethod
+    def save_state(self, learner_id, key, value):
+        """Queue a JSON-serializable state write."""
+
+    @abc.abstractmethod
+    def flush(self):
+        """Write all queued changes to the backend."""
+
+    def close(self):
+        self.flush()
+
+
+class SQLiteProgressStore(ProgressStore):
+    """SQLite backend with batched writes.
+
+    Writes are buffered in memory and flushed in a single transaction when
+    `batch_size` entries are pending or `flush_interval` seconds have passed.
+    Reads merge the pending buffer so a learner always sees their own writes.
+    """
+
+    def __init__(self, path, batch_size=50, flush_interval=2.0):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._pending_answers = {}
+        self._pending_state = {}
+        self._timer = None
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        atexit.register(self.close)
+
+    def load(self, learner_id):
+        with self._lock:
+            # Single keyed read over both tables
+            rows = self._conn.execute(
+                "SELECT 'a', question_id, answer FROM answers WHERE learner_id = ? "
+                "UNION ALL "
+                "SELECT 's', key, value FROM learner_state WHERE learner_id = ?",
+                (learner_id, learner_id),
+            ).fetchall()
+
+            answers, state = {}, {}
+            for kind, key, value in rows:
+                if kind == 'a':
+                    answers[key] = value
+                else:
+                    try: state[key] = json.loads(value)
+                    except ValueError: pass
+
+            # Overlay writes that have not been flushed yet
+            for (lid, qid), (ans, _) in self._pending_answers.items():
+                if lid == learner_id:
+                    answers[qid] = ans
+            for (lid, key), (value, _) in self._pending_state.items():
+                if lid == learner_id:
+                    state[key] = json.loads(value)
+
+        return {"answers": answers, "state": state}
+
+    def record_answer(self, learner_id, question_id, answer):
+        with self._lock:
+            self._pending_answers[(learner_id, str(question_id))] = (answer, time.time())
+            self._maybe_flush()
+
+    def save_state(self, learner_id, key, value):
+        with self._lock:
+            self._pending_state[(learner_id, key)] = (json.dumps(value, separators=(',', ':')), time.time())
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._pending_answers) + len(self._pending_state) >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            # Make sure a quiet period still persists the buffer
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending_answers and not self._pending_state:
+                return
+
+            answers = [(lid, qid, ans, ts) for (lid, qid), (ans, ts) in self._pending_answers.items()]
+            state = [(lid, key, value, ts) for (lid, key), (value, ts) in self._pending_state.items()]
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO answers (learner_id, question_id, answer, answered_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (learner_id, question_id) DO UPDATE SET answer = excluded.answer, answered_at = excluded.answered_at",
+                    answers,
+                )
+                self._conn.executemany(
+                    "INSERT INTO learner_state (learner_id, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (learner_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    state,
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                # Pending writes are kept and retried on the next flush
+                logger.exception("Progress store flush failed (%d answers, %d state entries pending)",
+                                 len(answers), len(state))
+                return
+
+            self._pending_answers.clear()
+            self._pending_state.clear()
+
+
+# Registered backends, looked up by name from config
+BACKENDS = {
+    "sqlite": SQLiteProgressStore,
+}
+
+
+def create_progress_store(backend, **options):
+    """Instantiate a registered progress backend, or None if disabled."""
+    if not backend:
+        return None
+    factory = BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"Unknown progress backend: {backend}")
+    return factory(**options)
@@ -0,0 +1,83 @@
+from functools import cached_property
+
+from dedup_service import canonical_ids, find_duplicate_clusters
+from scoring_service import AnswerKey
+from search_service import SearchIndex, tokenize_questions
+from similarity_service import build_related_index
+from tag_service import build_tag_index
+
+
+class QuestionStore:
+    """Parsed question bank plus the indexes built over it.
+
+    Built once per bank version and shared across sessions, so every index
+    here must be treated as read-only.
+    """
+
+    def __init__(self, questions):
+        self.questions = questions
+        # Token lists are kept for the indexes built on first use
+        self.documents = tokenize_questions(questions)
+        self.search_index = SearchIndex(self.documents)
+        self.tag_index = build_tag_index(self.documents)  # tag -> tuple of indices
+        self.answer_key = AnswerKey(questions, self.tag_index)
+        self.id_index = self.answer_key.id_index  # question id -> index
+
+    @cached_property
+    def duplicate_clusters(self):
+        """Near-duplicate clusters (lists of indices), computed on first use."""
+        return find_duplicate_clusters(self.questions, documents=self.documents)
+
+    @cached_property
+    def cache_ids(self):
+        """Per-index question id for AI cache keys; duplicates share one id."""
+        return canonical_ids(self.questions, self.duplicate_clusters)
+
+    @cached_property
+    def duplicate_indices(self):
+        """Indices hidden when duplicates are collapsed (all but the first of each cluster)."""
+        return frozenset(idx for cluster in self.duplicate_clusters for idx in cluster[1:])
+
+    @cached_property
+    def related_index(self):
+        """Precomputed TF-IDF top-k neighbours, built on first use."""
+        return build_related_index(self.questions, documents=self.documents)
+
+    def related(self, idx):
+        """(question index, similarity) pairs most similar to `idx`; O(k)."""
+        return self.related_index.related(idx)
+
+    def index_of(self, question_id):
+        """Bank index for an official question number such as "361" or "#361", or None; O(1)."""
+        return self.id_index.get(str(question_id).strip().lstrip('#'))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, idx):
+        return self.questions[idx]
+
+    def search(self, query, limit=None):
+        """Question indices matching `query`, best match first."""
+        return self.search_index.search(query, limit=limit)
+
+    def tag_counts(self):
+        """Service tags with their question counts, most common first."""
+        return sorted(((tag, len(docs)) for tag, docs in self.tag_index.items()), key=lambda x: (-x[1], x[0]))
+
+    def filter_order(self, query="", tags=(), collapse_duplicates=False):
+        """Question order for a search query and/or any of the given service tags."""
+        if query:
+            order = self.search(query)
+        elif tags:
+            order = sorted({idx for tag in tags for idx in self.tag_index.get(tag, ())})
+        else:
+            order = range(len(self.questions))
+
+        if query and tags:
+            allowed = {idx for tag in tags for idx in self.tag_index.get(tag, ())}
+            order = [i for i in order if i in allowed]
+        if collapse_duplicates:
+            hidden = self.duplicate_indices
+            order = [i for i in order if i not in hidden]
+        return order
@@ -0,0 +1,18 @@
+"""Streamlit-independent quiz logic shared by the app, the JSON API and scripts."""
+
+from quiz_core import metrics
+from quiz_core.access import AccessCounter
+from quiz_core.admission import GenerationQueue
+from quiz_core.ai import AIContentService, parse_api_keys
+from quiz_core.cache import ContentCache, DriveCache, JsonFileCache, cache_backend_from_config
+from quiz_core.parser import parse_questions
+from quiz_core.profiler import RerunProfiler
+from quiz_core.revalidate import Revalidator
+from quiz_core.service import QuizService, public_question
+from quiz_core.usage import UsageLedger
+
+__all__ = [
+    "AIContentService", "AccessCounter", "ContentCache", "DriveCache", "GenerationQueue", "JsonFileCache", "QuizService",
+    "RerunProfiler", "Revalidator", "UsageLedger", "cache_backend_from_config", "metrics", "parse_api_keys",
+    "parse_questions", "public_question",
+]
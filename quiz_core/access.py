@@ -0,0 +1,75 @@
+import math
+import time
+from pathlib import Path
+
+from quiz_core.snapshot import FLUSH_INTERVAL, JsonSnapshot, read_json
+
+
+HALF_LIFE = 7 * 24 * 3600.0  # Seconds for an access to count half as much
+MIN_SCORE = 0.01  # Decayed scores below this are dropped when saving
+
+
+class AccessCounter:
+    """Exponentially decaying access counts per question, shared by all sessions.
+
+    record() is a dict update without a lock: under concurrent sessions an
+    increment may occasionally be lost, which only blurs a popularity
+    estimate. Counts use forward decay (increments grow with time instead of
+    every count shrinking), so recording stays O(1); the base time moves
+    forward on each save. With a `path`, counts are loaded on start and kept
+    there by a JsonSnapshot of the scores as of each save. Tools that only
+    read the app's counts pass `writable=False`.
+    """
+
+    def __init__(self, path=None, half_life=HALF_LIFE, flush_interval=FLUSH_INTERVAL, writable=True):
+        self.path = Path(path) if path else None
+        self.tau = float(half_life) / math.log(2)
+        self._base = time.time()
+        self._counts = {}
+        self._snapshot = None
+        if self.path is not None:
+            self._load()
+            if writable:
+                self._snapshot = JsonSnapshot(self.path, self._rebase, flush_interval, "Access counts")
+
+    def __len__(self):
+        return len(self._counts)
+
+    def record(self, key, weight=1.0):
+        growth = math.exp((time.time() - self._base) / self.tau)
+        self._counts[key] = self._counts.get(key, 0.0) + weight * growth
+        if self._snapshot is not None:
+            self._snapshot.maybe_flush()
+
+    def score(self, key):
+        """Decayed count of `key` now; 0.0 when never recorded."""
+        count = self._counts.get(key)
+        if not count:
+            return 0.0
+        return count * math.exp((self._base - time.time()) / self.tau)
+
+    def ranked(self, keys=None):
+        """`keys` (default: every recorded key) from most to least accessed."""
+        keys = list(self._counts) if keys is None else list(keys)
+        return sorted(keys, key=lambda k: self._counts.get(k, 0.0), reverse=True)
+
+    def flush(self):
+        """Write the counts now; skipped while another thread is writing."""
+        if self._snapshot is not None:
+            self._snapshot.flush()
+
+    def _rebase(self):
+        """Move the base time to now, drop negligible counts and return the snapshot payload."""
+        now = time.time()
+        decay = math.exp((self._base - now) / self.tau)
+        self._counts = {k: c * decay for k, c in list(self._counts.items()) if c * decay >= MIN_SCORE}
+        self._base = now
+        return {"at": round(now), "counts": {k: round(c, 3) for k, c in self._counts.items()}}
+
+    def _load(self):
+        data = read_json(self.path)
+        try:
+            self._base = float(data["at"])
+            self._counts = {k: float(v) for k, v in data["counts"].items()}
+        except (KeyError, TypeError, ValueError, AttributeError):
+            pass
@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from quiz_core import metrics
+
+
+WAIT_POLL = 0.5  # Seconds between queue-position updates for a waiting request
+SERVICE_TIME = 8.0  # Initial estimate of one generation, refined from observed runs
+
+
+class QueueFull(Exception):
+    """The request was shed on arrival: queue at capacity or expected wait beyond its deadline."""
+
+
+class DeadlineExceeded(Exception):
+    """The request waited past its deadline without getting a generation slot."""
+
+
+class Ticket:
+    __slots__ = ("owner", "deadline", "granted", "shed", "queued_at")
+
+    def __init__(self, owner, deadline):
+        self.owner = owner
+        self.deadline = deadline
+        self.granted = False
+        self.shed = False
+        self.queued_at = time.monotonic()
+
+
+class GenerationQueue:
+    """Process-wide admission control for model calls.
+
+    At most `slots` generations run at once. Waiting requests are queued
+    per owner (a session or API client) and granted round-robin, so one
+    owner with many requests cannot starve the others. Requests are shed
+    when `max_waiting` are already queued, when the estimated wait exceeds
+    `timeout`, or when the deadline passes while waiting. After
+    rate_limited() no slot is granted until the cooldown ends. Reports made
+    while a cooldown is active are ignored, since concurrent generations all
+    hit the same limit; a report after it ends doubles the next cooldown up
+    to `max_cooldown`.
+    """
+
+    def __init__(self, slots=2, max_waiting=100, timeout=90.0, cooldown=10.0, max_cooldown=60.0):
+        self.slots = max(1, int(slots))
+        self.max_waiting = int(max_waiting)
+        self.timeout = float(timeout)
+        self.cooldown = float(cooldown)
+        self.max_cooldown = float(max_cooldown)
+        self.paused_until = 0.0
+        self.service_time = SERVICE_TIME
+        self._backoff = self.cooldown
+        self._waiting = OrderedDict()  # owner -> deque of tickets, in round-robin order
+        self._size = 0
+        self._active = 0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config, default_slots=2):
+        """AI_MAX_CONCURRENT, AI_QUEUE_MAX, AI_QUEUE_TIMEOUT and AI_RATE_LIMIT_COOLDOWN from a mapping."""
+        return cls(
+            slots=config.get("AI_MAX_CONCURRENT") or default_slots,
+            max_waiting=config.get("AI_QUEUE_MAX") or 100,
+            timeout=config.get("AI_QUEUE_TIMEOUT") or 90.0,
+            cooldown=config.get("AI_RATE_LIMIT_COOLDOWN") or 10.0,
+        )
+
+    def depth(self):
+        return self._size
+
+    def active(self):
+        return self._active
+
+    @contextmanager
+    def slot(self, owner=None, on_wait=None):
+        """Hold one generation slot; see acquire()."""
+        ticket = self.acquire(owner, on_wait)
+        start = time.monotonic()
+        try:
+            yield ticket
+        finally:
+            self.release(time.monotonic() - start)
+
+    def acquire(self, owner=None, on_wait=None):
+        """Wait for a slot and return the granted Ticket.
+
+        `on_wait(position)` is called from the waiting thread whenever the
+        1-based queue position changes. Raises QueueFull or DeadlineExceeded.
+        """
+        now = time.monotonic()
+        ticket = Ticket(owner, now + self.timeout)
+        with self._cond:
+            expected_wait = max(0.0, self.paused_until - now) + self._size / self.slots * self.service_time
+            if self._size >= self.max_waiting or expected_wait > self.timeout:
+                metrics.inc("ai_queue_shed_total", reason="full")
+                raise QueueFull()
+            self._waiting.setdefault(owner, deque()).append(ticket)
+            self._size += 1
+            self._dispatch()
+
+        reported = None
+        while True:
+            with self._cond:
+                if not (ticket.granted or ticket.shed):
+                    now = time.monotonic()
+                    wake = min(now + WAIT_POLL, ticket.deadline)
+                    if self.paused_until > now:
+                        wake = min(wake, self.paused_until)
+                    self._cond.wait(max(0.0, wake - now))
+                    self._dispatch()  # Cooldowns end without a release to wake anyone
+                if ticket.granted:
+                    metrics.observe("ai_queue_wait_seconds", time.monotonic() - ticket.queued_at)
+                    return ticket
+                if ticket.shed or time.monotonic() >= ticket.deadline:
+                    self._remove(ticket)
+                    metrics.inc("ai_queue_shed_total", reason="deadline")
+                    raise DeadlineExceeded()
+                position = self._position(ticket)
+            if on_wait is not None and position != reported:
+                on_wait(position)
+                reported = position
+
+    def release(self, elapsed=None):
+        with self._cond:
+            self._active -= 1
+            if elapsed is not None:
+                self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+            self._dispatch()
+
+    def rate_limited(self):
+        """Every key is rate limited: stop granting slots for the current backoff.
+
+        Escalates at most once per cooldown window.
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self.paused_until > now:
+                return
+            self.paused_until = now + self._backoff
+            self._backoff = min(self._backoff * 2, self.max_cooldown)
+        metrics.inc("ai_queue_cooldowns_total")
+
+    def succeeded(self):
+        self._backoff = self.cooldown
+
+    def wait_cooldown(self, deadline):
+        """Sleep out a rate-limit pause; False when it would end after `deadline`."""
+        remaining = self.paused_until - time.monotonic()
+        if remaining <= 0:
+            return True
+        if time.monotonic() + remaining > deadline:
+            return False
+        time.sleep(remaining)
+        return True
+
+    def _dispatch(self):
+        # Caller holds self._cond
+        now = time.monotonic()
+        granted = False
+        while self._active < self.slots and self._waiting and now >= self.paused_until:
+            owner, tickets = next(iter(self._waiting.items()))
+            ticket = tickets.popleft()
+            self._size -= 1
+            if tickets:
+                self._waiting.move_to_end(owner)
+            else:
+                del self._waiting[owner]
+            if now >= ticket.deadline:
+                ticket.shed = True
+            else:
+                ticket.granted = True
+                self._active += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _remove(self, ticket):
+        tickets = self._waiting.get(ticket.owner)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+            self._size -= 1
+            if not tickets:
+                del self._waiting[ticket.owner]
+
+    def _position(self, ticket):
+        """1-based place in grant order: round-robin over owners, FIFO within one owner."""
+        rank = self._waiting[ticket.owner].index(ticket)
+        ahead = rank
+        before = True
+        for owner, tickets in self._waiting.items():
+            if owner == ticket.owner:
+                before = False
+            else:
+                ahead += min(len(tickets), rank + 1 if before else rank)
+        return ahead + 1
@@ -0,0 +1,331 @@
+import hashlib
+import threading
+import time
+from functools import lru_cache
+
+from quiz_core import metrics
+from quiz_core.admission import DeadlineExceeded, QueueFull
+from quiz_core.revalidate import Revalidator
+from quiz_core.usage import key_label
+from translations import get_text
+
+
+MODEL_NAME = 'gemini-3-flash-preview'
+DEFAULT_EXAM = "SAA-C03"
+
+EMPTY_RESPONSE = "⚠ AI trả về phản hồi rỗng (Stream Mode). Vui lòng thử lại."
+BUSY_RESPONSE = "⚠ AI đang quá tải, vui lòng thử lại sau ít phút."
+
+
+class GenerationFailed(Exception):
+    """No content was generated; `message` is the text shown to learners instead.
+
+    `busy` is set when the queue or every API key is saturated, so the
+    request may succeed if retried later.
+    """
+
+    def __init__(self, message, busy=False):
+        super().__init__(message)
+        self.message = message
+        self.busy = busy
+
+
+def parse_api_keys(config):
+    """Gemini keys from GOOGLE_API_KEYS (comma separated) or GOOGLE_API_KEY."""
+    if config.get("GOOGLE_API_KEYS"):
+        return [k.strip() for k in config["GOOGLE_API_KEYS"].split(",")]
+    if config.get("GOOGLE_API_KEY"):
+        return [config["GOOGLE_API_KEY"]]
+    return []
+
+
+def revalidate_rate(config, default=2.0):
+    """Stale entries regenerated per minute from AI_REVALIDATE_PER_MINUTE; 0 turns it off."""
+    value = config.get("AI_REVALIDATE_PER_MINUTE")
+    return default if value in (None, "") else float(value)
+
+
+def build_explanation_prompt(question, options, correct_answer, lang="vi", exam=DEFAULT_EXAM):
+    t = lambda key: get_text(lang, key)
+    return f"""
+            {t('ai_expert_intro').format(exam=exam)}
+
+            {t('ai_question_label')}
+            {question}
+
+            {t('ai_options_label')}
+            {options}
+
+            {t('ai_correct_answer_label')} {correct_answer}
+
+            {t('ai_output_requirements')}
+            {t('ai_no_greeting')}
+            {t('ai_no_conclusion')}
+            {t('ai_focus_content')}
+
+            {t('ai_structure_label')}
+            {t('ai_structure_1')}
+            {t('ai_structure_2')}
+            {t('ai_structure_3')}
+            {t('ai_structure_4')}
+            """
+
+
+def build_theory_prompt(question, options, lang="vi"):
+    t = lambda key: get_text(lang, key)
+    return f"""
+            {t('ai_theory_intro')}
+
+            {t('ai_theory_header')}
+
+            {t('ai_theory_context')}
+            {question}
+            {options}
+
+            {t('ai_theory_requirements')}
+            {t('ai_theory_req_1')}
+            {t('ai_theory_req_2')}
+            {t('ai_theory_req_3')}
+            {t('ai_theory_req_4')}
+            """
+
+
+@lru_cache(maxsize=None)
+def prompt_version(category, lang, model_name):
+    """Short hash of the prompt template and model that cached content was generated with."""
+    if category == "explanations":
+        template = build_explanation_prompt("{question}", "{options}", "{correct_answer}", lang, "{exam}")
+    else:
+        template = build_theory_prompt("{question}", "{options}", lang)
+    return hashlib.sha1(f"{model_name}\n{template}".encode('utf-8')).hexdigest()[:12]
+
+
+class AIContentService:
+    """Cached Gemini explanations and theories, independent of any UI.
+
+    `cache` needs get_entry(category, key) -> (value, version),
+    set(category, key, value, version) and stamp_unversioned(version_of). API keys rotate on 429 responses;
+    the rotation is shared by every caller of this instance. With a
+    GenerationQueue, cache misses wait for a generation slot (cache hits
+    never do), and when every key is rate limited the queue pauses all
+    generation instead of each caller retrying.
+
+    Entries generated from an older prompt template or model are still
+    served. Entries without a recorded version count as current; with
+    revalidation on, a background pass stamps them all with the current
+    version at start, so later prompt changes reach them too. With `revalidate_per_minute` they are also regenerated in the
+    background, only while no learner is waiting in the queue, highest
+    `popularity(category, key)` first. Every model call is recorded in
+    the `usage` UsageLedger when given.
+    """
+
+    def __init__(self, api_keys, cache, model_name=MODEL_NAME, queue=None, revalidate_per_minute=0, popularity=None,
+                 usage=None):
+        self.api_keys = list(api_keys)
+        self.cache = cache
+        self.model_name = model_name
+        self.queue = queue
+        self.usage = usage
+        self.key_index = 0
+        self._lock = threading.Lock()
+        self.revalidator = None
+        if revalidate_per_minute:
+            is_busy = (lambda: queue.depth() > 0) if queue is not None else None
+            self.revalidator = Revalidator(self._revalidate, revalidate_per_minute, is_busy, popularity)
+            # One bulk write for every legacy entry, off the request path
+            threading.Thread(target=self.stamp_legacy, name="ai-cache-stamp", daemon=True).start()
+
+    def current_key(self):
+        return self.api_keys[self.key_index % len(self.api_keys)] if self.api_keys else None
+
+    def configure(self):
+        """Configure Google Generative AI with current API key."""
+        import google.generativeai as genai
+        if not self.api_keys:
+            return False
+        genai.configure(api_key=self.current_key())
+        return True
+
+    def rotate_key(self):
+        """Rotate to next API key if rate limited."""
+        if not self.api_keys:
+            return
+        with self._lock:
+            self.key_index = (self.key_index + 1) % len(self.api_keys)
+        self.configure()
+
+    def generate(self, prompt):
+        """Stream one Gemini response and return the concatenated text."""
+        return self.stream(prompt)[0]
+
+    def stream(self, prompt):
+        """Stream one Gemini response: (text, (prompt tokens, completion tokens))."""
+        self.configure()  # Ensure current key is set
+        import google.generativeai as genai
+        model = genai.GenerativeModel(self.model_name)
+        with metrics.span("gemini_stream"):
+            start = time.perf_counter()
+            response = model.generate_content(prompt, stream=True)
+            text = ""
+            usage = None
+            first = True
+            for chunk in response:
+                if chunk.candidates and chunk.candidates[0].content.parts:
+                    if first:
+                        # Once per call, at the first chunk with content; empty and safety chunks do not count
+                        metrics.observe("gemini_ttft_seconds", time.perf_counter() - start, model=self.model_name)
+                        first = False
+                    text += chunk.text
+                # Running totals; the last chunk carries the counts for the whole response
+                usage = getattr(chunk, "usage_metadata", None) or usage
+        tokens = (getattr(usage, "prompt_token_count", 0) or 0, getattr(usage, "candidates_token_count", 0) or 0)
+        return text, tokens
+
+    def _account(self, category, cache_key, api_key, outcome, start, tokens=(0, 0)):
+        """Metrics and usage ledger entry for one model call that began at perf_counter() `start`."""
+        metrics.inc("gemini_requests_total", category=category, outcome=outcome)
+        for kind, count in zip(("prompt", "completion"), tokens):
+            if count:
+                metrics.inc("gemini_tokens_total", count, category=category, kind=kind)
+        if self.usage is not None:
+            lang = cache_key.rsplit("_", 1)[-1]
+            self.usage.record(
+                key_label(api_key), self.model_name, lang, category, outcome, *tokens, time.perf_counter() - start
+            )
+
+    def _cached_or_generate(self, category, cache_key, prompt, version, error_message, exhausted_message, owner=None,
+                            on_wait=None, raise_errors=False):
+        try:
+            return self._fetch(category, cache_key, prompt, version, error_message, exhausted_message, owner, on_wait)
+        except GenerationFailed as e:
+            if raise_errors:
+                raise
+            return e.message
+
+    def _fetch(self, category, cache_key, prompt, version, error_message, exhausted_message, owner, on_wait):
+        cached, cached_version = self.cache.get_entry(category, cache_key)
+        if cached:
+            # Entries written before versions were recorded count as current (see stamp_legacy)
+            if cached_version is not None and cached_version != version:
+                metrics.inc("ai_stale_served_total", category=category)
+                if self.revalidator is not None:
+                    self.revalidator.mark_stale(category, cache_key, prompt, version)
+            return cached
+        if self.queue is None:
+            return self._generate_with_retries(category, cache_key, prompt, version, error_message, exhausted_message)
+
+        try:
+            with self.queue.slot(owner, on_wait) as ticket:
+                # Another caller may have generated the same content while this one waited
+                cached = self.cache.get(category, cache_key)
+                if cached:
+                    return cached
+                return self._generate_with_retries(category, cache_key, prompt, version, error_message, exhausted_message, ticket.deadline)
+        except (QueueFull, DeadlineExceeded):
+            raise GenerationFailed(BUSY_RESPONSE, busy=True)
+
+    def stamp_legacy(self):
+        """Give entries written before versions existed the current prompt version; returns how many."""
+        def version_of(category, cache_key):
+            if category not in ("explanations", "theories"):
+                return None
+            return prompt_version(category, cache_key.rsplit("_", 1)[-1], self.model_name)
+
+        try:
+            stamped = self.cache.stamp_unversioned(version_of)
+        except Exception as e:
+            print(f"Cache version stamp failed: {e}")
+            return 0
+        if stamped:
+            metrics.inc("ai_cache_stamped_total", stamped)
+        return stamped
+
+    def _revalidate(self, category, cache_key, prompt, version):
+        """Regenerate one stale entry for the Revalidator; True once the cache holds `version`."""
+        try:
+            if self.queue is None:
+                self._generate_with_retries(category, cache_key, prompt, version, "{error}", "")
+            else:
+                with self.queue.slot("revalidate") as ticket:
+                    self._generate_with_retries(category, cache_key, prompt, version, "{error}", "", ticket.deadline)
+        except (QueueFull, DeadlineExceeded, GenerationFailed):
+            return False
+        return self.cache.get_entry(category, cache_key)[1] == version
+
+    def _generate_with_retries(self, category, cache_key, prompt, version, error_message, exhausted_message, deadline=None):
+        """Generated text, saved to the cache; raises GenerationFailed when none was produced."""
+        max_retries = min(len(self.api_keys) + 2, 6)  # Try shifting keys first
+        attempt = 0
+        while attempt < max_retries:
+            attempt += 1
+            start = time.perf_counter()
+            api_key = self.current_key()
+            try:
+                text, tokens = self.stream(prompt)
+                if not text:
+                    self._account(category, cache_key, api_key, "empty", start, tokens)
+                    raise GenerationFailed(EMPTY_RESPONSE)
+
+                # Save to cache
+                self._account(category, cache_key, api_key, "ok", start, tokens)
+                if self.queue is not None:
+                    self.queue.succeeded()
+                self.cache.set(category, cache_key, text, version)
+                return text
+            except GenerationFailed:
+                raise
+            except Exception as e:
+                if "429" in str(e):
+                    # Rotate key and retry
+                    self._account(category, cache_key, api_key, "rate_limited", start)
+                    self.rotate_key()
+                    if self.queue is not None and attempt >= len(self.api_keys):
+                        # Every key is limited: pause all generation, then retry until the deadline
+                        self.queue.rate_limited()
+                        if not self.queue.wait_cooldown(deadline):
+                            raise GenerationFailed(BUSY_RESPONSE, busy=True)
+                        attempt = 0
+                    continue
+                self._account(category, cache_key, api_key, "error", start)
+                raise GenerationFailed(error_message.format(error=str(e)))
+
+        raise GenerationFailed(exhausted_message)
+
+    def cached(self, category, question_id, lang="vi"):
+        """Cached response only; never calls the model."""
+        return self.cache.get(category, f"{question_id}_{lang}")
+
+    def explanation(self, question, options, correct_answer, question_id, lang="vi", exam=DEFAULT_EXAM, owner=None, on_wait=None,
+                    raise_errors=False):
+        """Get AI explanation for a question answer.
+
+        `owner` identifies the caller for fair queueing; `on_wait(position)`
+        reports its queue position while it waits for a generation slot.
+        Failures return a warning text, or raise GenerationFailed with
+        `raise_errors`.
+        """
+        return self._cached_or_generate(
+            "explanations",
+            f"{question_id}_{lang}",
+            build_explanation_prompt(question, options, correct_answer, lang, exam),
+            prompt_version("explanations", lang, self.model_name),
+            "⚠ Không thể tải phân tích từ AI. Lỗi: {error}",
+            "⚠ Không thể tải phân tích từ AI sau nhiều lần thử.",
+            owner,
+            on_wait,
+            raise_errors,
+        )
+
+    def theory(self, question, options, question_id, lang="vi", owner=None, on_wait=None, raise_errors=False):
+        """Get AI theory explanation for AWS concepts in question."""
+        return self._cached_or_generate(
+            "theories",
+            f"{question_id}_{lang}",
+            build_theory_prompt(question, options, lang),
+            prompt_version("theories", lang, self.model_name),
+            "⚠ Lỗi tải lý thuyết: {error}",
+            "⚠ Không thể tải lý thuyết sau nhiều lần thử.",
+            owner,
+            on_wait,
+            raise_errors,
+        )
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Latency buckets in seconds: sub-ms cache hits up to multi-second Gemini streams
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PREFIX = "quiz_"
+WRITE_INTERVAL = 15.0  # Seconds between metric file rewrites
+
+_enabled = False
+_local = threading.local()  # Per-thread stack of open span names
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    """Histograms, counters and callback gauges rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.counters = {}  # (name, labels) -> float
+        self.gauges = {}  # name -> callable returning a number
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, labels=()):
+        with self._lock:
+            hist = self.histograms.get((name, labels))
+            if hist is None:
+                hist = self.histograms[(name, labels)] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name, amount=1, labels=()):
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+    def render(self):
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        lines = []
+        typed = set()
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), hist in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), hist.counts):
+                cumulative += count
+                lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {hist.total:.6f}")
+            lines.append(f"{PREFIX}{name}_count{_labels(labels)} {hist.count}")
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        for name, fn in sorted(self.gauges.items()):
+            declare(name, "gauge")
+            try:
+                lines.append(f"{PREFIX}{name} {fn()}")
+            except Exception as e:
+                print(f"Metrics gauge {name} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """Timed block recorded as span_seconds{span, parent}; parent is the enclosing span on this thread."""
+
+    __slots__ = ("name", "parent", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else ""
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _local.stack.pop()
+        REGISTRY.observe("span_seconds", elapsed, (("span", self.name), ("parent", self.parent)))
+        return False
+
+
+def span(name):
+    """Context manager timing a block; a shared no-op object when metrics are disabled."""
+    return Span(name) if _enabled else _NOOP
+
+
+def observe(name, value, **labels):
+    if _enabled:
+        REGISTRY.observe(name, value, tuple(sorted(labels.items())))
+
+
+def inc(name, amount=1, **labels):
+    if _enabled:
+        REGISTRY.inc(name, amount, tuple(sorted(labels.items())))
+
+
+def register_gauge(name, fn):
+    """Gauge evaluated at scrape time, e.g. memory held by live sessions."""
+    REGISTRY.gauges[name] = fn
+
+
+def enabled():
+    return _enabled
+
+
+def write_file(path):
+    """Atomically rewrite a node_exporter textfile-collector file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes would flood the app log
+
+
+def configure(config=os.environ):
+    """Enable metrics when METRICS_FILE and/or METRICS_PORT is set; returns whether enabled.
+
+    METRICS_FILE is rewritten every WRITE_INTERVAL seconds from a daemon
+    thread; METRICS_PORT serves /metrics on localhost (METRICS_HOST to change).
+    METRICS_ENABLED is a boolean ("1", "true" or "yes"), so "0" keeps them off.
+    """
+    global _enabled
+    path = config.get("METRICS_FILE")
+    port = config.get("METRICS_PORT")
+    enabled = str(config.get("METRICS_ENABLED", "")).strip().lower() in ("1", "true", "yes")
+    if not (path or port or enabled):
+        return False
+    _enabled = True
+
+    if path:
+        def writer():
+            while True:
+                time.sleep(WRITE_INTERVAL)
+                try:
+                    write_file(path)
+                except OSError as e:
+                    print(f"Metrics write error: {e}")
+        threading.Thread(target=writer, name="metrics-file", daemon=True).start()
+
+    if port:
+        server = ThreadingHTTPServer((config.get("METRICS_HOST", "127.0.0.1"), int(port)), _MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return True
@@ -0,0 +1,94 @@
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+from pathlib import Path
+
+
+SUMMARY_LINES = 40  # Functions listed in the .txt summary next to each .pstats file
+_UNSAFE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def _slug(value, fallback):
+    return _UNSAFE.sub('-', str(value or ''))[:40].strip('-') or fallback
+
+
+class RerunProfiler:
+    """Deterministic cProfile of selected reruns, one output file pair per run.
+
+    Each profiled run writes `<time>_q<question>_<action>.pstats` (open with
+    `python -m pstats` or snakeviz) and a `.txt` summary sorted by cumulative
+    time into `directory`. `arm(n)` queues the next n reruns of any session;
+    only one run is profiled at a time, others run normally without using
+    the budget, which is only taken once a run is sure to be profiled.
+    """
+
+    def __init__(self, directory, reruns=0):
+        self.directory = Path(directory)
+        self.remaining = max(0, int(reruns))
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+
+    def arm(self, reruns):
+        with self._lock:
+            self.remaining = max(0, int(reruns))
+
+    def _take(self):
+        """Use one rerun of the process-wide budget; False when none is left."""
+        if not self.remaining:
+            return False
+        with self._lock:
+            if not self.remaining:
+                return False
+            self.remaining -= 1
+            return True
+
+    def run(self, fn, tag, budget=True, on_write=None):
+        """Call fn() under cProfile and write its stats.
+
+        `tag()` returns (question_id, action) and is called after fn, so
+        it sees the question the rerun ended on. With `budget` the run uses
+        one rerun of the process-wide budget and is not profiled when none is
+        left; without, the caller has its own allowance. `on_write(path)` is
+        called once the stats are written. Exceptions from fn (including
+        Streamlit's rerun/stop signals) propagate after the stats are written.
+        Returns the .pstats path, or None when fn ran without profiling.
+        """
+        if not self._busy.acquire(blocking=False):
+            fn()
+            return None
+        if budget and not self._take():
+            self._busy.release()
+            fn()
+            return None
+        try:
+            profile = cProfile.Profile()
+            start = time.time()
+            profile.enable()
+            try:
+                fn()
+            finally:
+                profile.disable()
+                question_id, action = tag()
+                path = self.write(profile, start, question_id, action)
+                if on_write is not None:
+                    on_write(path)
+        finally:
+            self._busy.release()
+        return path
+
+    def write(self, profile, start, question_id, action):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(start)) + f"-{int(start * 1000) % 1000:03d}"
+        base = self.directory / f"{stamp}_q{_slug(question_id, 'none')}_{_slug(action, 'rerun')}"
+        profile.dump_stats(f"{base}.pstats")
+
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out)
+        out.write(f"question: {question_id}\naction: {action}\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+        Path(f"{base}.txt").write_text(out.getvalue(), encoding='utf-8')
+        print(f"[PROFILE] {base}.pstats ({stats.total_tt:.3f}s)")
+        return Path(f"{base}.pstats")
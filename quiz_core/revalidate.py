@@ -0,0 +1,74 @@
+import threading
+import time
+
+from quiz_core import metrics
+
+
+IDLE_POLL = 5.0  # Seconds between checks while interactive generations are queued
+
+
+class Revalidator:
+    """Background regeneration of stale AI cache entries (stale-while-revalidate).
+
+    Callers keep serving the stale text and report it with mark_stale(). A
+    daemon thread regenerates at most `per_minute` entries a minute, most
+    popular first, and only while `is_busy()` is false so learners waiting
+    for new content always go first. Popularity is `priority(category, key)`
+    when given, otherwise the number of times the entry was served stale.
+    """
+
+    def __init__(self, regenerate, per_minute=2.0, is_busy=None, priority=None):
+        self.regenerate = regenerate  # fn(category, key, prompt, version) -> True when the entry was refreshed
+        self.interval = 60.0 / per_minute
+        self.is_busy = is_busy or (lambda: False)
+        self.priority = priority
+        self._pending = {}  # (category, key) -> [stale hits, prompt, version]
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def mark_stale(self, category, key, prompt, version):
+        with self._lock:
+            entry = self._pending.get((category, key))
+            if entry is None:
+                self._pending[(category, key)] = [1, prompt, version]
+                metrics.inc("ai_stale_entries_total", category=category)
+            else:
+                entry[0] += 1
+                entry[1:] = [prompt, version]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ai-revalidate", daemon=True)
+                self._thread.start()
+            self._wake.set()
+
+    def _pop_most_popular(self):
+        with self._lock:
+            if not self._pending:
+                self._wake.clear()  # Under the lock so a concurrent mark_stale() cannot be missed
+                return None
+            if self.priority is None:
+                item = max(self._pending, key=lambda k: self._pending[k][0])
+            else:
+                item = max(self._pending, key=lambda k: (self.priority(*k), self._pending[k][0]))
+            return item, self._pending.pop(item)[1:]
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            if self.is_busy():
+                time.sleep(IDLE_POLL)
+                continue
+            popped = self._pop_most_popular()
+            if popped is None:
+                continue
+            (category, key), (prompt, version) = popped
+            try:
+                refreshed = self.regenerate(category, key, prompt, version)
+            except Exception as e:
+                print(f"Revalidate {category}/{key} failed: {e}")
+                refreshed = False
+            metrics.inc("ai_revalidations_total", category=category, outcome="ok" if refreshed else "failed")
+            time.sleep(self.interval)
@@ -0,0 +1,109 @@
+import threading
+
+from bank_registry import DEFAULT_BANK
+from question_store import QuestionStore
+from quiz_core.parser import parse_questions
+from scoring_service import answer_mask, mask_letters
+
+
+# Fields that would give the answer away to a client before it submits
+ANSWER_FIELDS = ("correct_answer", "suggested_answer_text", "discussion_link")
+
+
+def public_question(q):
+    """Question payload without the answer fields."""
+    return {k: v for k, v in q.items() if k not in ANSWER_FIELDS}
+
+
+class QuizService:
+    """Question lookup, grading, progress and AI content for any front end.
+
+    Banks are parsed and indexed on first request and rebuilt when their
+    file changes; every method is safe to call from several threads.
+    """
+
+    def __init__(self, banks, progress_store=None, ai=None):
+        self.banks = banks  # exam code -> ExamBank
+        self.progress_store = progress_store
+        self.ai = ai  # AIContentService or None
+        self._stores = {}  # exam code -> (mtime, QuestionStore)
+        self._lock = threading.Lock()
+
+    def bank(self, code=DEFAULT_BANK):
+        """ExamBank for a code; KeyError for unknown exams."""
+        return self.banks[code.upper()]
+
+    def store(self, code=DEFAULT_BANK):
+        bank = self.bank(code)
+        mtime = bank.mtime()
+        with self._lock:
+            cached = self._stores.get(bank.code)
+            if cached is None or cached[0] != mtime:
+                questions = parse_questions(bank.path.read_text(encoding='utf-8'), bank.meta_marker)
+                cached = (mtime, QuestionStore(questions))
+                self._stores[bank.code] = cached
+        return cached[1]
+
+    def question(self, code, question_id):
+        """Question dict by official id, or None."""
+        store = self.store(code)
+        idx = store.index_of(question_id)
+        return None if idx is None else store[idx]
+
+    def grade(self, code, question_id, answer):
+        """Grade an answer such as "BD"; None for unknown questions."""
+        store = self.store(code)
+        idx = store.index_of(question_id)
+        if idx is None:
+            return None
+        correct = int(store.answer_key.correct[idx])
+        mask = answer_mask(answer)
+        return {
+            "question_id": store[idx]['id'],
+            "answer": mask_letters(mask),
+            "correct": mask == correct and correct != 0,
+            "correct_answer": mask_letters(correct),
+        }
+
+    def submit_answer(self, code, learner_id, question_id, answer):
+        """Grade and, when a progress store is configured, record the answer."""
+        result = self.grade(code, question_id, answer)
+        if result is not None and self.progress_store is not None and learner_id:
+            key = self.bank(code).progress_key(learner_id)
+            self.progress_store.record_answer(key, result["question_id"], result["answer"])
+        return result
+
+    def progress(self, code, learner_id):
+        """Answers and accuracy counts for a learner, or None without a progress store."""
+        if self.progress_store is None:
+            return None
+        store = self.store(code)
+        answers = self.progress_store.load(self.bank(code).progress_key(learner_id))["answers"]
+        stats = store.answer_key.stats(store.answer_key.encode_answers(answers))
+        return {"answers": answers, **stats}
+
+    def ai_content(self, code, question_id, kind, lang="vi", generate=False, owner=None):
+        """Cached explanation ("explanations") or theory ("theories") for a question.
+
+        Only reads the cache unless `generate` is set, in which case a miss
+        calls the model (slow; run it off the event loop). `owner` is the
+        caller's identity for fair queueing of generations. A failed
+        generation raises GenerationFailed rather than returning its
+        warning text, so callers never mistake it for content.
+        """
+        if self.ai is None:
+            return None
+        store = self.store(code)
+        idx = store.index_of(question_id)
+        if idx is None:
+            return None
+        bank = self.bank(code)
+        q = store[idx]
+        cache_id = bank.cache_id(store.cache_ids[idx])  # Same id the app uses
+        if not generate:
+            return self.ai.cached(kind, cache_id, lang)
+        opts_text = "\n".join(q['options'])
+        if kind == "theories":
+            return self.ai.theory(q['question'], opts_text, cache_id, lang, owner=owner, raise_errors=True)
+        return self.ai.explanation(q['question'], opts_text, q['correct_answer'], cache_id, lang, bank.code, owner=owner,
+                                   raise_errors=True)
@@ -0,0 +1,58 @@
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+FLUSH_INTERVAL = 60.0  # Seconds between writes of a snapshot file
+
+
+def read_json(path):
+    """Parsed JSON of a snapshot file; None when it is missing or unreadable."""
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+class JsonSnapshot:
+    """Periodic compact-JSON snapshots of in-memory state, for counters that must never block their callers.
+
+    `snapshot()` returns the payload to write. The recording thread calls
+    maybe_flush(), which writes at most every `interval` seconds; one more
+    write happens at exit. A flush is skipped while another thread is
+    writing, and the file is replaced atomically so readers never see a
+    partial write.
+    """
+
+    def __init__(self, path, snapshot, interval=FLUSH_INTERVAL, label="Snapshot"):
+        self.path = Path(path)
+        self.snapshot = snapshot
+        self.interval = float(interval)
+        self.label = label
+        self._flushing = threading.Lock()
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def maybe_flush(self):
+        if time.monotonic() - self._flushed_at >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if not self._flushing.acquire(blocking=False):
+            return
+        try:
+            self._flushed_at = time.monotonic()
+            self._write(self.snapshot())
+        finally:
+            self._flushing.release()
+
+    def _write(self, payload):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding='utf-8')
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"{self.label} save failed: {e}")
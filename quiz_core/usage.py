@@ -0,0 +1,108 @@
+import threading
+import time
+from pathlib import Path
+
+from quiz_core.snapshot import FLUSH_INTERVAL, JsonSnapshot, read_json
+
+
+BUCKET_SECONDS = 3600  # Calls are aggregated per hour
+RETENTION_HOURS = 14 * 24  # Older buckets are dropped on save
+DIMENSIONS = ("key", "model", "lang", "category", "outcome")
+
+
+def key_label(api_key):
+    """Identifies an API key in reports without storing the key itself."""
+    return f"...{api_key[-4:]}" if api_key else "none"
+
+
+class UsageLedger:
+    """Token, latency and outcome totals of Gemini calls, per hour and dimension.
+
+    Each record() adds one call to the bucket for its hour and its
+    (key, model, lang, category, outcome). Buckets older than
+    `retention_hours` are dropped, so the store stays small however many
+    calls are made. With a `path`, buckets are loaded on start and kept
+    there by a JsonSnapshot.
+    """
+
+    def __init__(self, path=None, retention_hours=RETENTION_HOURS, flush_interval=FLUSH_INTERVAL):
+        self.path = Path(path) if path else None
+        self.retention_hours = int(retention_hours)
+        self._buckets = {}  # (hour, key, model, lang, category, outcome) -> [calls, prompt, completion, latency sum, latency max]
+        self._lock = threading.Lock()
+        self._snapshot = None
+        if self.path is not None:
+            self._buckets = load_buckets(self.path)
+            self._snapshot = JsonSnapshot(self.path, self._prune, flush_interval, "AI usage")
+
+    def record(self, key, model, lang, category, outcome, prompt_tokens=0, completion_tokens=0, latency=0.0):
+        hour = int(time.time() // BUCKET_SECONDS)
+        with self._lock:
+            totals = self._buckets.setdefault((hour, key, model, lang, category, outcome), [0, 0, 0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += prompt_tokens or 0
+            totals[2] += completion_tokens or 0
+            totals[3] += latency
+            totals[4] = max(totals[4], latency)
+        if self._snapshot is not None:
+            self._snapshot.maybe_flush()
+
+    def rows(self):
+        with self._lock:
+            return [list(k) + list(v) for k, v in self._buckets.items()]
+
+    def flush(self):
+        """Write the buckets now; skipped while another thread is writing."""
+        if self._snapshot is not None:
+            self._snapshot.flush()
+
+    def _prune(self):
+        """Drop expired buckets and return the snapshot payload."""
+        oldest = int(time.time() // BUCKET_SECONDS) - self.retention_hours
+        with self._lock:
+            self._buckets = {k: v for k, v in self._buckets.items() if k[0] > oldest}
+        rows = [row[:9] + [round(row[9], 3), round(row[10], 3)] for row in self.rows()]
+        return {"bucket_seconds": BUCKET_SECONDS, "rows": rows}
+
+
+def load_buckets(path):
+    """Buckets from a saved usage file; empty when it is missing or unreadable."""
+    try:
+        return {tuple(row[:6]): list(row[6:]) for row in read_json(path)["rows"]}
+    except (KeyError, TypeError):
+        return {}
+
+
+def summarize(rows, by=("category",), since_hours=None):
+    """Totals of `rows` grouped by the DIMENSIONS named in `by`, busiest group first.
+
+    Token means are per successful call, since failed calls return no usage.
+    """
+    oldest = int(time.time() // BUCKET_SECONDS) - since_hours if since_hours else None
+    groups = {}
+    for row in rows:
+        if oldest is not None and row[0] <= oldest:
+            continue
+        dims = dict(zip(DIMENSIONS, row[1:6]))
+        group = groups.setdefault(tuple(dims[d] for d in by), {
+            **{d: dims[d] for d in by}, "calls": 0, "ok": 0, "rate_limited": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "latency_sum": 0.0, "latency_max": 0.0,
+        })
+        calls, prompt, completion, latency_sum, latency_max = row[6:]
+        group["calls"] += calls
+        if dims["outcome"] == "ok":
+            group["ok"] += calls
+        elif dims["outcome"] == "rate_limited":
+            group["rate_limited"] += calls
+        group["prompt_tokens"] += prompt
+        group["completion_tokens"] += completion
+        group["latency_sum"] += latency_sum
+        group["latency_max"] = max(group["latency_max"], latency_max)
+
+    summary = sorted(groups.values(), key=lambda g: g["calls"], reverse=True)
+    for group in summary:
+        ok = group["ok"] or 1
+        group["mean_prompt_tokens"] = group["prompt_tokens"] / ok
+        group["mean_completion_tokens"] = group["completion_tokens"] / ok
+        group["mean_latency"] = group.pop("latency_sum") / group["calls"]
+    return summary
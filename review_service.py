@@ -0,0 +1,104 @@
+import base64
+import heapq
+import struct
+import time
+
+
+DAY = 86400
+RELEARN_SECONDS = 600  # Missed questions come back after 10 minutes
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+
+# question id, ease x100, interval (days), repetitions, due (epoch seconds)
+_CARD = struct.Struct("<IHfBI")
+
+
+class ReviewScheduler:
+    """SM-2 spaced-repetition scheduler with a min-heap of due times.
+
+    Cards are keyed by question id so the schedule survives bank re-sorts.
+    Heap entries are (due, question_id); entries made stale by a later
+    review are skipped lazily when popped.
+    """
+
+    def __init__(self):
+        self.cards = {}  # question id -> [ease, interval_days, reps, due]
+        self._heap = []
+
+    def __len__(self):
+        return len(self.cards)
+
+    def review(self, question_id, correct, now=None):
+        """Update the card after an answer and schedule its next review."""
+        now = int(time.time() if now is None else now)
+        ease, interval, reps, _ = self.cards.get(question_id, [DEFAULT_EASE, 0.0, 0, 0])
+        quality = 4 if correct else 1
+
+        if quality < 3:
+            reps = 0
+            interval = RELEARN_SECONDS / DAY
+        else:
+            reps += 1
+            interval = 1.0 if reps == 1 else (6.0 if reps == 2 else round(interval * ease, 2))
+        ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+        due = now + int(interval * DAY)
+        self.cards[question_id] = [ease, interval, min(reps, 255), due]
+        heapq.heappush(self._heap, (due, question_id))
+
+    def pop_due(self, now=None, limit=20):
+        """Pop up to `limit` question ids that are due, earliest first."""
+        now = int(time.time() if now is None else now)
+        due_ids = []
+        while self._heap and len(due_ids) < limit:
+            due, qid = self._heap[0]
+            if due > now:
+                break
+            heapq.heappop(self._heap)
+            card = self.cards.get(qid)
+            if card is None or card[3] != due or qid in due_ids:
+                continue  # Stale or duplicate entry
+            due_ids.append(qid)
+        return due_ids
+
+    def restore(self, question_ids, now=None):
+        """Put popped but unreviewed questions back on the heap."""
+        now = int(time.time() if now is None else now)
+        for qid in question_ids:
+            card = self.cards.get(qid)
+            # Reviewed cards were already re-pushed with a future due time
+            if card is not None and card[3] <= now:
+                heapq.heappush(self._heap, (card[3], qid))
+
+    def due_count(self, now=None):
+        now = int(time.time() if now is None else now)
+        return sum(1 for card in self.cards.values() if card[3] <= now)
+
+    def next_due(self):
+        """Epoch seconds of the next scheduled review, or None."""
+        while self._heap:
+            due, qid = self._heap[0]
+            card = self.cards.get(qid)
+            if card is not None and card[3] == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def serialize(self):
+        """Compact base64 form (15 bytes per card) for progress storage."""
+        buf = bytearray()
+        for qid, (ease, interval, reps, due) in self.cards.items():
+            buf += _CARD.pack(int(qid), int(round(ease * 100)), interval, reps, due)
+        return base64.b64encode(bytes(buf)).decode('ascii')
+
+    @classmethod
+    def deserialize(cls, data):
+        scheduler = cls()
+        if not data:
+            return scheduler
+        raw = base64.b64decode(data)
+        for qid, ease, interval, reps, due in _CARD.iter_unpack(raw):
+            scheduler.cards[str(qid)] = [ease / 100, interval, reps, due]
+        scheduler._heap = [(card[3], qid) for qid, card in scheduler.cards.items()]
+        heapq.heapify(scheduler._heap)
+        return scheduler
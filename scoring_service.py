@@ -0,0 +1,76 @@
+import numpy as np
+from scipy import sparse
+
+
+LETTERS = "ABCDEF"
+
+
+def answer_mask(letters):
+    """Bitmask for an answer string such as "BD" (A=1, B=2, C=4, ...)."""
+    mask = 0
+    for ch in letters or "":
+        pos = LETTERS.find(ch)
+        if pos >= 0:
+            mask |= 1 << pos
+    return mask
+
+
+def mask_letters(mask):
+    """Inverse of answer_mask."""
+    return "".join(ch for i, ch in enumerate(LETTERS) if mask >> i & 1)
+
+
+class AnswerKey:
+    """Correct answers and expected counts as arrays aligned with question indices.
+
+    User answers use the same uint8 bitmask encoding (0 = unanswered), so
+    every statistic is a handful of vectorized comparisons.
+    """
+
+    def __init__(self, questions, tag_index=None):
+        self.size = len(questions)
+        self.correct = np.fromiter((answer_mask(q['correct_answer']) for q in questions), dtype=np.uint8, count=self.size)
+        self.expected = np.fromiter((q['expected_count'] for q in questions), dtype=np.uint8, count=self.size)
+        self.id_index = {q['id']: i for i, q in enumerate(questions)}
+
+        # Sparse tag x question membership matrix for per-tag aggregation
+        self.tags = sorted(tag_index or {})
+        rows, cols = [], []
+        for row, tag in enumerate(self.tags):
+            cols.extend(tag_index[tag])
+            rows.extend([row] * len(tag_index[tag]))
+        self.tag_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(self.tags), self.size)
+        )
+
+    def encode_answers(self, user_answers):
+        """uint8 array of answer bitmasks from a {question_id: "AB"} dict."""
+        arr = np.zeros(self.size, dtype=np.uint8)
+        for qid, ans in user_answers.items():
+            idx = self.id_index.get(qid)
+            if idx is not None:
+                arr[idx] = answer_mask(ans)
+        return arr
+
+    def stats(self, answers, session_mask=None):
+        """Overall and per-session answered/correct counts."""
+        answered = answers != 0
+        correct = answered & (answers == self.correct)
+        result = {
+            "total": self.size,
+            "answered": int(np.count_nonzero(answered)),
+            "correct": int(np.count_nonzero(correct)),
+        }
+        if session_mask is not None:
+            result["session_answered"] = int(np.count_nonzero(answered & session_mask))
+            result["session_correct"] = int(np.count_nonzero(correct & session_mask))
+        return result
+
+    def tag_stats(self, answers):
+        """{tag: (answered, correct)} for every tag with at least one answer."""
+        answered = (answers != 0).astype(np.int32)
+        correct = answered & (answers == self.correct)
+        answered_per_tag = self.tag_matrix @ answered
+        correct_per_tag = self.tag_matrix @ correct.astype(np.int32)
+        hit = np.flatnonzero(answered_per_tag)
+        return {self.tags[i]: (int(answered_per_tag[i]), int(correct_per_tag[i])) for i in hit}
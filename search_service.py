@@ -0,0 +1,114 @@
+import math
+import re
+from bisect import bisect_left
+
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+OPTION_PREFIX_RE = re.compile(r'^[A-F]\.\s+')
+
+# Very common words that only add noise to ranking
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in is it its of on or that the
+this to was will with which what when where who company solution solutions
+""".split())
+
+# Prefix expansions score lower than exact term matches
+PREFIX_WEIGHT = 0.6
+MIN_PREFIX_LEN = 3
+MAX_PREFIX_EXPANSIONS = 30
+
+
+def tokenize(text):
+    """Lowercase word/number tokens without stopwords."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def question_document(q):
+    """Searchable text for a parsed question: body plus option texts."""
+    options = " ".join(OPTION_PREFIX_RE.sub('', opt) for opt in q['options'])
+    return f"{q['question']} {options}"
+
+
+def tokenize_questions(questions):
+    """Token list per question, shared by the search and tag indexes."""
+    return [tokenize(question_document(q)) for q in questions]
+
+
+class SearchIndex:
+    """Inverted index over the question bank with BM25 ranking.
+
+    Query terms are matched exactly and by prefix against the sorted
+    vocabulary, so partial service names such as "dynamo" or "kines" find
+    DynamoDB and Kinesis questions. All query terms must match (AND).
+    `documents` is the output of tokenize_questions().
+    """
+
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> {doc: tf}
+        lengths = []
+
+        for doc, tokens in enumerate(documents):
+            lengths.append(len(tokens))
+            for term in tokens:
+                tf = self.postings.setdefault(term, {})
+                tf[doc] = tf.get(doc, 0) + 1
+
+        n = len(lengths)
+        avg_len = (sum(lengths) / n) if n else 1.0
+        self.num_docs = n
+        self.vocab = sorted(self.postings)
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+        # Per-document BM25 length normalisation, precomputed once
+        self.norms = [k1 * (1 - b + b * length / avg_len) for length in lengths]
+
+    def expand(self, term):
+        """Vocabulary terms matching `term` exactly or by prefix, with weights."""
+        matches = []
+        if term in self.postings:
+            matches.append((term, 1.0))
+        if len(term) >= MIN_PREFIX_LEN:
+            i = bisect_left(self.vocab, term)
+            while i < len(self.vocab) and len(matches) < MAX_PREFIX_EXPANSIONS:
+                cand = self.vocab[i]
+                if not cand.startswith(term):
+                    break
+                if cand != term:
+                    matches.append((cand, PREFIX_WEIGHT))
+                i += 1
+        return matches
+
+    def search(self, query, limit=None):
+        """Return question indices matching every query term, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        k1 = self.k1
+        norms = self.norms
+        scores = None
+        # Rarest terms first keeps the candidate set small
+        expanded = sorted((self.expand(t) for t in terms), key=lambda m: sum(len(self.postings[c]) for c, _ in m))
+        for matches in expanded:
+            term_scores = {}
+            for cand, weight in matches:
+                idf = self.idf[cand] * weight
+                for doc, tf in self.postings[cand].items():
+                    if scores is not None and doc not in scores:
+                        continue
+                    s = idf * tf * (k1 + 1) / (tf + norms[doc])
+                    if s > term_scores.get(doc, 0.0):
+                        term_scores[doc] = s
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc: scores[doc] + s for doc, s in term_scores.items()}
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))
+        return ranked[:limit] if limit else ranked
@@ -0,0 +1,108 @@
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import islice
+
+
+DEFAULT_MAX_BYTES = 512 * 1024  # Per category per session (~50-100 AI answers)
+EVICTION_SAMPLE = 5  # Least recently used entries compared by score() when evicting
+
+# Every live memory, so process-wide usage can be reported without touching sessions
+_live = weakref.WeakSet()
+_live_lock = threading.Lock()
+
+
+def _entry_size(key, value):
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class BoundedAIMemory:
+    """Size-bounded LRU of AI texts for one session, keyed like the shared cache.
+
+    Evicted keys are remembered; asking for one again reloads it from the
+    shared cache through `fallback(category, key)`, so eviction costs a
+    cache read instead of a new Gemini call. Keys that were never stored
+    are not looked up, keeping membership checks on every rerun free.
+
+    With `score(category, key)` (question popularity), eviction removes the
+    lowest-scoring of the few least recently used entries instead of
+    strictly the oldest, so content other learners keep asking for stays.
+    """
+
+    def __init__(self, category, fallback, max_bytes=DEFAULT_MAX_BYTES, owner=None, score=None):
+        self.category = category
+        self.fallback = fallback
+        self.score = score
+        self.max_bytes = max_bytes
+        self.owner = owner
+        self._items = OrderedDict()
+        self._evicted = set()
+        self.bytes = 0
+        self.evictions = 0
+        self.reloads = 0
+        with _live_lock:
+            _live.add(self)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        if key in self._items:
+            return True
+        if key in self._evicted:
+            self._evicted.discard(key)
+            value = self.fallback(self.category, key)
+            if value:
+                self.reloads += 1
+                self[key] = value
+                return True
+        return False
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def __setitem__(self, key, value):
+        if key in self._items:
+            self.bytes -= _entry_size(key, self._items[key])
+        self._items[key] = value
+        self._items.move_to_end(key)
+        self.bytes += _entry_size(key, value)
+        self._evicted.discard(key)
+
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.bytes > self.max_bytes and len(self._items) > 1:
+            old_key = self._eviction_candidate()
+            old_value = self._items.pop(old_key)
+            self.bytes -= _entry_size(old_key, old_value)
+            self._evicted.add(old_key)
+            self.evictions += 1
+
+    def _eviction_candidate(self):
+        if self.score is None:
+            return next(iter(self._items))
+        oldest = islice(self._items, min(EVICTION_SAMPLE, len(self._items) - 1))
+        return min(oldest, key=lambda k: self.score(self.category, k))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def usage(self):
+        return {
+            "owner": self.owner,
+            "category": self.category,
+            "items": len(self._items),
+            "bytes": self.bytes,
+            "evictions": self.evictions,
+            "reloads": self.reloads,
+        }
+
+
+def sessions_usage():
+    """usage() of every live session memory in the process."""
+    with _live_lock:
+        memories = list(_live)
+    return [memory.usage() for memory in memories]
@@ -0,0 +1,88 @@
+import random
+
+
+ROUNDS = 4
+SMALL_ORDER = 64  # Below this, Feistel permutations over a few bits are often close to the identity
+
+
+class ShuffledOrder:
+    """Seeded permutation of a base question order, computed per position.
+
+    A balanced Feistel network over the smallest even-width bit domain that
+    covers len(base) is a bijection; cycle-walking keeps outputs in range.
+    Nothing is materialized, so lookups are O(1) and a session only needs
+    to remember the seed. Orders shorter than SMALL_ORDER use a seeded
+    random.sample table instead, which is cheap at that size.
+    """
+
+    __slots__ = ("base", "seed", "_half_bits", "_mask", "_keys", "_table")
+
+    def __init__(self, base, seed):
+        self.base = base
+        self.seed = int(seed)
+        bits = max(2, (len(base) - 1).bit_length())
+        bits += bits & 1
+        self._half_bits = bits // 2
+        self._mask = (1 << self._half_bits) - 1
+        rng = random.Random(self.seed)
+        self._keys = tuple(rng.getrandbits(32) for _ in range(ROUNDS))
+        self._table = None
+        if len(base) < SMALL_ORDER:
+            self._table = tuple(random.Random(self.seed).sample(range(len(base)), len(base)))
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, position):
+        n = len(self.base)
+        if position < 0:
+            position += n
+        if not 0 <= position < n:
+            raise IndexError("question order index out of range")
+        if self._table is not None:
+            return self.base[self._table[position]]
+        return self.base[self._walk(position, self._encrypt)]
+
+    def __iter__(self):
+        for position in range(len(self.base)):
+            yield self[position]
+
+    def __contains__(self, value):
+        return value in self.base
+
+    def index(self, value):
+        """Position of a question index, inverting the permutation."""
+        if self._table is not None:
+            return self._table.index(self.base.index(value))
+        return self._walk(self.base.index(value), self._decrypt)
+
+    def _walk(self, x, step):
+        # Cycle-walk: re-apply until the value lands inside the base range
+        n = len(self.base)
+        x = step(x)
+        while x >= n:
+            x = step(x)
+        return x
+
+    def _round(self, value, key):
+        x = (value * 0x9E3779B1 ^ key) & 0xFFFFFFFF
+        x ^= x >> 15
+        x = (x * 0x85EBCA77) & 0xFFFFFFFF
+        x ^= x >> 13
+        return x & self._mask
+
+    def _encrypt(self, x):
+        left, right = x >> self._half_bits, x & self._mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return left << self._half_bits | right
+
+    def _decrypt(self, x):
+        left, right = x >> self._half_bits, x & self._mask
+        for key in reversed(self._keys):
+            left, right = right ^ self._round(left, key), left
+        return left << self._half_bits | right
+
+
+def new_seed():
+    return random.randrange(1, 1 << 31)
@@ -0,0 +1,83 @@
+import numpy as np
+from scipy import sparse
+
+from search_service import tokenize_questions
+
+
+DEFAULT_TOP_K = 5
+CHUNK_ROWS = 512
+
+
+def tfidf_matrix(documents):
+    """L2-normalised TF-IDF matrix (CSR, one row per question)."""
+    vocab = {}
+    indptr = [0]
+    indices = []
+    counts = []
+    for tokens in documents:
+        tf = {}
+        for term in tokens:
+            col = vocab.setdefault(term, len(vocab))
+            tf[col] = tf.get(col, 0) + 1
+        indices.extend(tf.keys())
+        counts.extend(tf.values())
+        indptr.append(len(indices))
+
+    n = len(documents)
+    x = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+        shape=(n, len(vocab)),
+    )
+    # Sublinear tf, smoothed idf
+    x.data = 1 + np.log(x.data)
+    df = np.bincount(x.indices, minlength=len(vocab))
+    idf = np.log((1 + n) / (1 + df)).astype(np.float32) + 1
+    x = x.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(x).tocsr().astype(np.float32)
+
+
+class RelatedIndex:
+    """Top-k most similar questions per question, by TF-IDF cosine similarity.
+
+    The full similarity matrix is never held in memory: rows are multiplied
+    in chunks and only the k best neighbours of each row are kept, so lookups
+    at render time are a slice of a small (n, k) array.
+    """
+
+    def __init__(self, documents, k=DEFAULT_TOP_K):
+        x = tfidf_matrix(documents)
+        n = x.shape[0]
+        k = max(0, min(k, n - 1))
+        self.neighbours = np.zeros((n, k), dtype=np.int32)
+        self.scores = np.zeros((n, k), dtype=np.float32)
+        if not k:
+            return
+
+        xt = x.T.tocsc()
+        for start in range(0, n, CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, n)
+            sims = (x[start:stop] @ xt).toarray()
+            sims[np.arange(stop - start), np.arange(start, stop)] = -1  # Exclude self
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            self.neighbours[start:stop] = np.take_along_axis(top, order, axis=1)
+            self.scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+
+    def related(self, idx, min_score=0.1):
+        """(question index, similarity) pairs for `idx`, most similar first."""
+        return [
+            (int(j), float(s))
+            for j, s in zip(self.neighbours[idx], self.scores[idx])
+            if s >= min_score
+        ]
+
+
+def build_related_index(questions, k=DEFAULT_TOP_K, documents=None):
+    """RelatedIndex over `questions`; pass `documents` when they are already tokenized."""
+    if documents is None:
+        documents = tokenize_questions(questions)
+    return RelatedIndex(documents, k=k)
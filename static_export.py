@@ -0,0 +1,216 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import markdown
+    HAS_MARKDOWN = True
+except ImportError:
+    HAS_MARKDOWN = False
+
+from bank_registry import discover_banks
+from dedup_service import canonical_ids, find_duplicate_clusters
+from quiz_core import ContentCache, cache_backend_from_config, parse_questions
+from search_service import STOPWORDS, tokenize_questions
+from translations import get_available_languages, get_text
+
+
+ROOT = Path(__file__).parent
+ASSETS_DIR = ROOT / "static_site"
+ASSETS = ("site.css", "quiz.js")
+
+# Bump when the page template changes so every page is rebuilt once
+TEMPLATE_VERSION = 1
+
+# UI always in English
+t = lambda key: get_text('en', key)
+
+
+def render_markdown(text):
+    """AI text as HTML. Raw HTML in the text is escaped, as st.markdown does by default."""
+    if not HAS_MARKDOWN:
+        return "".join(f"<p>{html.escape(p)}</p>" for p in text.split("\n\n"))
+    md = markdown.Markdown(extensions=["fenced_code", "tables", "sane_lists"])
+    md.preprocessors.deregister("html_block")
+    md.inlinePatterns.deregister("html")
+    return md.convert(text)
+
+
+def ai_sections(ai_texts):
+    parts = []
+    for kind, title in (("explanations", t('ai_analysis_title')), ("theories", t('ai_theory_title'))):
+        for lang, info in get_available_languages().items():
+            text = ai_texts.get(kind, {}).get(lang)
+            if text:
+                parts.append(
+                    f'<details class="ai" hidden><summary>{title} · {info["flag"]} {info["name"]}</summary>'
+                    f'{render_markdown(text)}</details>'
+                )
+    return "\n".join(parts)
+
+
+def page_shell(title, body, asset_prefix):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<link rel="stylesheet" href="{asset_prefix}assets/site.css">
+<script src="{asset_prefix}assets/quiz.js" defer></script>
+</head>
+<body><main>
+{body}
+</main></body>
+</html>
+"""
+
+
+def render_question_page(bank, q, position, total, prev_id, next_id, ai_texts):
+    input_type = "checkbox" if q['is_multiselect'] else "radio"
+    options = "\n".join(
+        f'<label><input type="{input_type}" name="answer" value="{html.escape(opt.split(".")[0])}"> {html.escape(opt)}</label>'
+        for opt in q['options']
+    )
+    hint = f'<p class="muted">{t("select_all")}</p>' if q['is_multiselect'] else ""
+    discussion = ""
+    if q.get('discussion_link'):
+        discussion = f'<p class="muted"><a href="{html.escape(q["discussion_link"])}" rel="nofollow">{t("see_discussion")}</a></p>'
+    prev_link = f'<a href="{prev_id}.html">{t("btn_previous")}</a>' if prev_id else "<span></span>"
+    next_link = f'<a href="{next_id}.html">{t("btn_next")}</a>' if next_id else "<span></span>"
+
+    body = f"""<p><a href="../index.html">{html.escape(bank.title)}</a></p>
+<div class="question-header"><strong>{t('question')} #{position}</strong><span>ID {q['id']} · {position} {t('of')} {total}</span></div>
+<div class="question-card">{html.escape(q['question'])}</div>
+{hint}
+<form class="quiz" data-answer="{html.escape(q['correct_answer'] or '')}" data-correct-label="{html.escape(t('correct'))}" data-incorrect-label="{html.escape(t('incorrect'))}">
+{options}
+<button type="submit">{t('btn_submit')}</button>
+</form>
+<div id="feedback" hidden></div>
+{ai_sections(ai_texts)}
+{discussion}
+<nav class="pager">{prev_link}{next_link}</nav>"""
+    return page_shell(f"{bank.code} {t('question')} {q['id']}", body, "../../")
+
+
+def render_index_page(bank, questions):
+    items = "\n".join(
+        f'<li><a href="q/{q["id"]}.html">#{q["id"]}</a> {html.escape(q["question"][:140])}</li>'
+        for q in questions
+    )
+    body = f"""<h1>{html.escape(bank.title)}</h1>
+<input id="search" type="search" placeholder="{t('search')}" data-index="search.json" disabled>
+<p id="search-count" class="muted"></p>
+<ol class="questions">
+{items}
+</ol>"""
+    return page_shell(bank.title, body, "../")
+
+
+def build_search_index(questions):
+    """Sorted vocabulary with aligned posting lists (positions in bank order)."""
+    postings = {}
+    for doc, tokens in enumerate(tokenize_questions(questions)):
+        for term in set(tokens):
+            postings.setdefault(term, []).append(doc)
+    vocab = sorted(postings)
+    return {"stopwords": sorted(STOPWORDS), "vocab": vocab, "postings": [postings[term] for term in vocab]}
+
+
+def write_if_changed(path, content):
+    """Write text unless the file already holds it; returns True when written."""
+    data = content.encode('utf-8')
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def page_hash(*parts):
+    payload = json.dumps([TEMPLATE_VERSION, *parts], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def export_bank(bank, cache_data, out_dir, force=False):
+    """Export one bank; only pages whose question, neighbours or AI text changed are rendered."""
+    questions = parse_questions(bank.path.read_text(encoding='utf-8'), bank.meta_marker)
+    cache_ids = canonical_ids(questions, find_duplicate_clusters(questions))
+    bank_dir = out_dir / bank.code
+    manifest_path = bank_dir / "manifest.json"
+    manifest = {} if force or not manifest_path.exists() else json.loads(manifest_path.read_text(encoding='utf-8'))
+    langs = list(get_available_languages())
+
+    written = skipped = 0
+    new_manifest = {}
+    for i, q in enumerate(questions):
+        cache_id = bank.cache_id(cache_ids[i])
+        ai_texts = {
+            kind: {lang: cache_data.get(kind, {}).get(f"{cache_id}_{lang}") for lang in langs}
+            for kind in ("explanations", "theories")
+        }
+        prev_id = questions[i - 1]['id'] if i > 0 else None
+        next_id = questions[i + 1]['id'] if i + 1 < len(questions) else None
+        # Everything the page shows: numbering and bank title change when questions are added or removed
+        digest = page_hash(q, i + 1, len(questions), bank.title, prev_id, next_id, ai_texts)
+        new_manifest[q['id']] = digest
+
+        page = bank_dir / "q" / f"{q['id']}.html"
+        if manifest.get(q['id']) == digest and page.exists():
+            skipped += 1
+            continue
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text(render_question_page(bank, q, i + 1, len(questions), prev_id, next_id, ai_texts), encoding='utf-8')
+        written += 1
+
+    # Pages of questions removed from the bank
+    removed = 0
+    for qid in set(manifest) - set(new_manifest):
+        stale = bank_dir / "q" / f"{qid}.html"
+        if stale.exists():
+            stale.unlink()
+            removed += 1
+
+    write_if_changed(bank_dir / "index.html", render_index_page(bank, questions))
+    write_if_changed(bank_dir / "search.json", json.dumps(build_search_index(questions), separators=(',', ':')))
+    write_if_changed(manifest_path, json.dumps(new_manifest, indent=0, sort_keys=True))
+    return {"exam": bank.code, "questions": len(questions), "written": written, "unchanged": skipped, "removed": removed}
+
+
+def export_site(out_dir, exams=None, force=False, config=os.environ):
+    out_dir = Path(out_dir)
+    banks = discover_banks(ROOT, ROOT / "banks")
+    selected = [banks[code.upper()] for code in exams] if exams else list(banks.values())
+    cache_path = config.get("AI_CACHE_PATH", ROOT / "ai_cache.json")
+    cache_data = ContentCache(cache_backend_from_config(config, cache_path)).load()
+
+    for name in ASSETS:
+        target = out_dir / "assets" / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(ASSETS_DIR / name, target)
+
+    reports = [export_bank(bank, cache_data, out_dir, force) for bank in selected]
+    links = "\n".join(f'<li><a href="{b.code}/index.html">{html.escape(b.title)}</a></li>' for b in selected)
+    write_if_changed(out_dir / "index.html", page_shell("AWS Exam Prep", f"<h1>AWS Exam Prep</h1>\n<ul>\n{links}\n</ul>", ""))
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export question banks and cached AI content as a static site.")
+    parser.add_argument("--out", default=str(ROOT / "site"), help="Output directory")
+    parser.add_argument("--exam", action="append", help="Exam code to export (repeatable); default all banks")
+    parser.add_argument("--force", action="store_true", help="Rebuild every page")
+    args = parser.parse_args()
+
+    for report in export_site(args.out, args.exam, args.force):
+        print(f"{report['exam']}: {report['written']} written, {report['unchanged']} unchanged, "
+              f"{report['removed']} removed ({report['questions']} questions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+// Client-side answer checker and search for the static export.
+// No network calls except loading search.json on the index page.
+(function () {
+    "use strict";
+
+    var MIN_PREFIX_LEN = 3;  // Same as search_service.MIN_PREFIX_LEN
+
+    function checkAnswer(form) {
+        var picked = Array.prototype.map.call(
+            form.querySelectorAll("input:checked"),
+            function (input) { return input.value; }
+        ).sort().join("");
+        if (!picked) {
+            return;
+        }
+        var answer = form.dataset.answer;
+        var feedback = document.getElementById("feedback");
+        var strong = function (text) {
+            var el = document.createElement("strong");
+            el.textContent = text;
+            return el;
+        };
+        feedback.textContent = "";
+        if (picked === answer) {
+            feedback.className = "success-msg";
+            feedback.append(form.dataset.correctLabel + " ", strong(picked));
+        } else {
+            feedback.className = "error-msg";
+            feedback.append(form.dataset.incorrectLabel + " ", strong(picked), ". Correct answer: ", strong(answer));
+        }
+        feedback.hidden = false;
+        // Explanations stay hidden until the learner has committed to an answer
+        document.querySelectorAll("details.ai").forEach(function (el) { el.hidden = false; });
+    }
+
+    function tokenize(text, stopwords) {
+        return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(function (t) {
+            return !stopwords.has(t);
+        });
+    }
+
+    function lowerBound(items, value) {
+        var lo = 0, hi = items.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (items[mid] < value) { lo = mid + 1; } else { hi = mid; }
+        }
+        return lo;
+    }
+
+    function matchTerm(index, term) {
+        // Exact match, plus prefix matches for longer terms (vocab is sorted)
+        var docs = new Set();
+        var i = lowerBound(index.vocab, term);
+        for (; i < index.vocab.length; i++) {
+            var word = index.vocab[i];
+            if (word !== term && (term.length < MIN_PREFIX_LEN || word.indexOf(term) !== 0)) {
+                break;
+            }
+            index.postings[i].forEach(function (doc) { docs.add(doc); });
+        }
+        return docs;
+    }
+
+    function search(index, query) {
+        var terms = tokenize(query, index.stopwords);
+        if (!terms.length) {
+            return null;
+        }
+        var result = null;
+        terms.forEach(function (term) {
+            var docs = matchTerm(index, term);
+            result = result === null ? docs : new Set(Array.from(result).filter(function (d) { return docs.has(d); }));
+        });
+        return result;
+    }
+
+    function initSearch(input) {
+        var items = document.querySelectorAll("ol.questions li");
+        var count = document.getElementById("search-count");
+        fetch(input.dataset.index).then(function (r) { return r.json(); }).then(function (index) {
+            index.stopwords = new Set(index.stopwords);
+            input.disabled = false;
+            input.addEventListener("input", function () {
+                var hits = search(index, input.value);
+                var shown = 0;
+                items.forEach(function (li, doc) {
+                    li.hidden = hits !== null && !hits.has(doc);
+                    shown += li.hidden ? 0 : 1;
+                });
+                count.textContent = hits === null ? "" : shown + " / " + items.length;
+            });
+        });
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        var form = document.querySelector("form.quiz");
+        if (form) {
+            form.addEventListener("submit", function (event) {
+                event.preventDefault();
+                checkAnswer(form);
+            });
+        }
+        var input = document.getElementById("search");
+        if (input) {
+            initSearch(input);
+        }
+    });
+})();
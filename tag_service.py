@@ -0,0 +1,189 @@
+from search_service import tokenize
+
+
+# Curated AWS service dictionary: tag -> aliases as they appear in question text.
+# Aliases are matched on whole tokens (see search_service.tokenize), so "route 53"
+# matches "Route 53" and "lex" never matches inside "flexible".
+AWS_SERVICES = {
+    "EC2": ["ec2", "elastic compute cloud"],
+    "EC2 Pricing": ["spot instance", "spot instances", "reserved instance", "reserved instances", "savings plan", "savings plans", "dedicated hosts", "dedicated instances"],
+    "EC2 Auto Scaling": ["auto scaling"],
+    "Elastic Load Balancing": ["elb", "load balancer", "application load balancer", "network load balancer", "gateway load balancer", "alb", "nlb"],
+    "EBS": ["ebs", "elastic block store"],
+    "Instance Store": ["instance store"],
+    "EFS": ["efs", "elastic file system"],
+    "FSx": ["fsx"],
+    "S3": ["s3", "simple storage service"],
+    "S3 Glacier": ["glacier"],
+    "Storage Gateway": ["storage gateway", "file gateway", "volume gateway", "tape gateway"],
+    "DataSync": ["datasync"],
+    "Snow Family": ["snowball", "snowcone", "snowmobile", "snow family"],
+    "Transfer Family": ["transfer family", "sftp"],
+    "AWS Backup": ["aws backup"],
+    "VPC": ["vpc", "vpcs", "virtual private cloud", "subnet", "subnets"],
+    "NAT Gateway": ["nat gateway", "nat gateways", "nat instance"],
+    "VPC Endpoints": ["privatelink", "vpc endpoint", "vpc endpoints", "interface endpoint", "gateway endpoint"],
+    "Transit Gateway": ["transit gateway"],
+    "Direct Connect": ["direct connect"],
+    "Site-to-Site VPN": ["vpn", "site to site vpn"],
+    "Route 53": ["route 53", "route53"],
+    "CloudFront": ["cloudfront"],
+    "Global Accelerator": ["global accelerator"],
+    "API Gateway": ["api gateway"],
+    "Lambda": ["lambda"],
+    "Step Functions": ["step functions"],
+    "SQS": ["sqs", "simple queue service"],
+    "SNS": ["sns", "simple notification service"],
+    "EventBridge": ["eventbridge", "cloudwatch events"],
+    "Kinesis": ["kinesis"],
+    "Kinesis Data Firehose": ["firehose", "kinesis data firehose"],
+    "MSK": ["msk", "managed streaming for apache kafka"],
+    "Amazon MQ": ["amazon mq"],
+    "AppSync": ["appsync"],
+    "RDS": ["rds", "relational database service"],
+    "Aurora": ["aurora"],
+    "DynamoDB": ["dynamodb"],
+    "DAX": ["dax", "dynamodb accelerator"],
+    "ElastiCache": ["elasticache", "redis", "memcached"],
+    "Redshift": ["redshift"],
+    "Neptune": ["neptune"],
+    "DocumentDB": ["documentdb"],
+    "Keyspaces": ["keyspaces"],
+    "Timestream": ["timestream"],
+    "QLDB": ["qldb", "quantum ledger database"],
+    "DMS": ["dms", "database migration service"],
+    "Application Migration Service": ["application migration service", "mgn"],
+    "Athena": ["athena"],
+    "Glue": ["glue"],
+    "EMR": ["emr"],
+    "OpenSearch": ["opensearch", "elasticsearch"],
+    "QuickSight": ["quicksight"],
+    "Lake Formation": ["lake formation"],
+    "SageMaker": ["sagemaker"],
+    "Rekognition": ["rekognition"],
+    "Textract": ["textract"],
+    "Comprehend": ["comprehend"],
+    "Transcribe": ["transcribe"],
+    "Polly": ["polly"],
+    "Lex": ["lex"],
+    "ECS": ["ecs", "elastic container service"],
+    "EKS": ["eks", "elastic kubernetes service"],
+    "Fargate": ["fargate"],
+    "ECR": ["ecr", "elastic container registry"],
+    "Elastic Beanstalk": ["beanstalk"],
+    "Lightsail": ["lightsail"],
+    "AWS Batch": ["aws batch"],
+    "Outposts": ["outposts"],
+    "IAM": ["iam", "identity and access management"],
+    "IAM Identity Center": ["identity center", "aws sso", "single sign on"],
+    "Organizations": ["organizations", "service control policy", "service control policies", "scp", "scps"],
+    "Control Tower": ["control tower"],
+    "Cognito": ["cognito"],
+    "Directory Service": ["directory service", "ad connector", "managed microsoft ad"],
+    "Resource Access Manager": ["resource access manager"],
+    "KMS": ["kms", "key management service"],
+    "CloudHSM": ["cloudhsm"],
+    "Secrets Manager": ["secrets manager"],
+    "Systems Manager": ["systems manager", "ssm", "parameter store", "session manager"],
+    "Certificate Manager": ["acm", "certificate manager"],
+    "WAF": ["waf"],
+    "Shield": ["shield"],
+    "GuardDuty": ["guardduty"],
+    "Macie": ["macie"],
+    "Inspector": ["inspector"],
+    "Security Hub": ["security hub"],
+    "Detective": ["amazon detective"],
+    "Firewall Manager": ["firewall manager"],
+    "Network Firewall": ["network firewall"],
+    "CloudWatch": ["cloudwatch"],
+    "CloudTrail": ["cloudtrail"],
+    "AWS Config": ["aws config"],
+    "X-Ray": ["x ray"],
+    "CloudFormation": ["cloudformation"],
+    "Trusted Advisor": ["trusted advisor"],
+    "Compute Optimizer": ["compute optimizer"],
+    "Cost Management": ["cost explorer", "aws budgets", "cost and usage report"],
+    "IoT Core": ["iot core"],
+}
+
+
+class TokenMatcher:
+    """Aho-Corasick automaton over word tokens.
+
+    Patterns are token sequences; a single pass over a document's tokens
+    reports every pattern occurrence, regardless of how many patterns exist.
+    """
+
+    def __init__(self, patterns):
+        # patterns: {label: [token tuple, ...]}
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+
+        for label, seqs in patterns.items():
+            for seq in seqs:
+                state = 0
+                for tok in seq:
+                    nxt = self.goto[state].get(tok)
+                    if nxt is None:
+                        nxt = len(self.goto)
+                        self.goto[state][tok] = nxt
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.out.append(())
+                    state = nxt
+                if label not in self.out[state]:
+                    self.out[state] = self.out[state] + (label,)
+
+        # Breadth-first failure links
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for tok, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and tok not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(tok, 0)
+                self.out[nxt] = self.out[nxt] + tuple(l for l in self.out[self.fail[nxt]] if l not in self.out[nxt])
+
+    def labels(self, tokens):
+        """Set of labels whose patterns occur in `tokens`."""
+        goto, fail, out = self.goto, self.fail, self.out
+        root = goto[0]
+        found = set()
+        state = 0
+        for tok in tokens:
+            if state == 0:
+                # Fast path: most tokens are not the start of any pattern
+                state = root.get(tok, 0)
+            else:
+                while state and tok not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(tok, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+_matcher = None
+
+
+def get_service_matcher():
+    """Matcher over AWS_SERVICES, built once per process."""
+    global _matcher
+    if _matcher is None:
+        _matcher = TokenMatcher({
+            tag: [tuple(tokenize(alias)) for alias in aliases]
+            for tag, aliases in AWS_SERVICES.items()
+        })
+    return _matcher
+
+
+def build_tag_index(documents):
+    """Map service tag -> tuple of question indices from tokenized documents."""
+    matcher = get_service_matcher()
+    index = {}
+    for doc, tokens in enumerate(documents):
+        for tag in matcher.labels(tokens):
+            index.setdefault(tag, []).append(doc)
+    return {tag: tuple(docs) for tag, docs in index.items()}
@@ -26,6 +26,31 @@ TRANSLATIONS = {
         "total_qs": "Tổng số",
         "done": "Hoàn thành",
         "search": "🔍 Tìm kiếm",
+        "filter_services": "🏷️ Lọc theo dịch vụ AWS",
+        "hide_duplicates": "Ẩn câu hỏi trùng lặp",
+        "related_questions": "🔗 Câu hỏi liên quan",
+        "accuracy": "chính xác",
+        "this_session": "Phiên này",
+        "weakest_services": "Dịch vụ cần ôn thêm",
+        
+        # Spaced Repetition
+        "review_mode": "🔁 Ôn tập ngắt quãng",
+        "btn_start_review": "Ôn câu đến hạn",
+        "review_next_due": "Lượt ôn tiếp theo sau",
+        "review_empty": "Trả lời câu hỏi để bắt đầu lịch ôn tập.",
+        
+        # Mock Exam
+        "mock_exam": "🎓 Thi thử",
+        "mock_exam_desc": "65 câu hỏi · 130 phút · chấm điểm khi nộp bài",
+        "exam_seed": "Mã đề",
+        "btn_start_exam": "Bắt đầu thi",
+        "btn_finish_exam": "🏁 Nộp bài",
+        "btn_exit_exam": "Thoát chế độ thi",
+        "exam_passed": "Đạt! Điểm của bạn:",
+        "exam_failed": "Chưa đạt. Điểm của bạn:",
+        "correct_count": "Số câu đúng",
+        "exam_duration": "Thời gian",
+        "exam_review": "Xem lại bài làm",
         "shuffle": "🔀 Xáo trộn",
         "reset": "🔄 Làm mới",
         
@@ -48,6 +73,9 @@ TRANSLATIONS = {
         "correct": "Đúng rồi! Bạn đã chọn:",
         "incorrect": "Sai rồi. Bạn đã chọn:",
         "no_matches": "Không tìm thấy kết quả",
+        "question_not_found": "Không có câu hỏi với ID này",
+        "exam_bank": "Bộ đề",
+        "ai_memory": "🧠 Bộ nhớ AI",
         
         # AI Sections
         "ai_analysis_title": "🤖 Phân Tích (AI Teacher)",
@@ -57,12 +85,13 @@ TRANSLATIONS = {
         # Loading
         "loading_theory": "Đang tổng hợp kiến thức...",
         "loading_explanation": "Đang phân tích câu hỏi... (Gemini AI)",
+        "ai_queue_position": "⏳ Đang chờ lượt AI: vị trí {position} trong hàng đợi",
         
         # Upload
         "upload_file": "Tải lên file .md",
         
         # AI Prompts
-        "ai_expert_intro": "Bạn là chuyên gia AWS SAA-C03. Nhiệm vụ của bạn là phân tích câu hỏi trắc nghiệm này để giải thích cho học viên.",
+        "ai_expert_intro": "Bạn là chuyên gia AWS {exam}. Nhiệm vụ của bạn là phân tích câu hỏi trắc nghiệm này để giải thích cho học viên.",
         "ai_question_label": "**Câu hỏi:**",
         "ai_options_label": "**Các lựa chọn:**",
         "ai_correct_answer_label": "**Đáp án đúng:**",
@@ -95,6 +124,31 @@ TRANSLATIONS = {
         "total_qs": "Total",
         "done": "Done",
         "search": "🔍 Search",
+        "filter_services": "🏷️ Filter by AWS service",
+        "hide_duplicates": "Hide near-duplicate questions",
+        "related_questions": "🔗 Related questions",
+        "accuracy": "correct",
+        "this_session": "This session",
+        "weakest_services": "Weakest services",
+        
+        # Spaced Repetition
+        "review_mode": "🔁 Spaced repetition",
+        "btn_start_review": "Review due questions",
+        "review_next_due": "Next review due in",
+        "review_empty": "Answer questions to start your review schedule.",
+        
+        # Mock Exam
+        "mock_exam": "🎓 Mock exam",
+        "mock_exam_desc": "65 questions · 130 minutes · graded on submit",
+        "exam_seed": "Exam seed",
+        "btn_start_exam": "Start exam",
+        "btn_finish_exam": "🏁 Finish & grade",
+        "btn_exit_exam": "Exit exam mode",
+        "exam_passed": "Passed! Your score:",
+        "exam_failed": "Not passed. Your score:",
+        "correct_count": "Correct",
+        "exam_duration": "Duration",
+        "exam_review": "Review answers",
         "shuffle": "🔀 Shuffle",
         "reset": "🔄 Reset",
         
@@ -117,6 +171,9 @@ TRANSLATIONS = {
         "correct": "Correct! You answered:",
         "incorrect": "Incorrect. You answered:",
         "no_matches": "No matches found",
+        "question_not_found": "No question with this ID",
+        "exam_bank": "Exam",
+        "ai_memory": "🧠 AI memory",
         
         # AI Sections
         "ai_analysis_title": "🤖 Analysis",
@@ -126,12 +183,13 @@ TRANSLATIONS = {
         # Loading
         "loading_theory": "Compiling knowledge...",
         "loading_explanation": "Analyzing question...",
+        "ai_queue_position": "⏳ Waiting for AI: position {position} in queue",
         
         # Upload
         "upload_file": "Upload .md file",
         
         # AI Prompts
-        "ai_expert_intro": "You are an AWS SAA-C03 expert. Your task is to analyze this multiple-choice question to explain it to students.",
+        "ai_expert_intro": "You are an AWS {exam} expert. Your task is to analyze this multiple-choice question to explain it to students.",
         "ai_question_label": "**Question:**",
         "ai_options_label": "**Options:**",
         "ai_correct_answer_label": "**Correct Answer:**",
@@ -1,3 +1,4 @@
+import html
 import streamlit as st
 from translations import get_text, get_available_languages
 # Force refresh for Streamlit Cloud - 2026-01-16 v2
@@ -34,14 +35,31 @@ def render_language_selector():
     
     st.divider()
 
-def render_page_header():
+def render_page_header(exam_title=None):
     """Render the main page title."""
-    st.markdown("""
+    title = f"{exam_title} Prep" if exam_title else "AWS Certified Solutions Architect Associate Prep (SAA-C03)"
+    st.markdown(f"""
         <h1 style="text-align: center; color: #232f3e; margin-top: 0; margin-bottom: 2rem; font-size: 2.2rem;">
-            AWS Certified Solutions Architect Associate Prep (SAA-C03)
+            {title}
         </h1>
     """, unsafe_allow_html=True)
 
+def render_exam_selector(banks, current_code, on_select):
+    """Render the exam bank picker. Hidden when only one bank is available."""
+    if len(banks) < 2:
+        return
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    codes = list(banks)
+    choice = st.selectbox(
+        t('exam_bank'),
+        codes,
+        index=codes.index(current_code) if current_code in codes else 0,
+        format_func=lambda code: f"{code} · {banks[code].title}",
+    )
+    if choice != current_code:
+        on_select(choice)
+
 def render_preserve_scroll():
     """Inject JavaScript to preserve scroll position during rerun."""
     st.markdown("""
@@ -80,14 +98,16 @@ def render_footer():
         </div>
     """, unsafe_allow_html=True)
 
-def render_question_header(idx_ptr, total):
-    """Render question number and progress."""
+def render_question_header(idx_ptr, total, question_id=None):
+    """Render question number, official question id and progress."""
     # UI always in English
     t = lambda key: get_text('en', key)
+    id_badge = f'<span style="font-size: 0.875rem; color: #64748b;">ID {question_id}</span>' if question_id else ""
     st.markdown(f"""
 <div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 1rem;">
     <div style="display: flex; align-items: center; gap: 0.75rem;">
         <span style="font-size: 1.5rem; font-weight: 700; color: #232f3e;">{t('question')} #{idx_ptr+1}</span>
+        {id_badge}
     </div>
     <span style="font-size: 0.875rem; color: #64748b; font-weight: 500;">{idx_ptr+1} {t('of')} {total}</span>
 </div>
@@ -97,8 +117,9 @@ def render_question_card(question_text, is_multiselect=False):
     """Render question text card."""
     # UI always in English
     t = lambda key: get_text('en', key)
+    text = html.escape(question_text, quote=False).replace("\n", "<br>")
     st.markdown(
-        f'<div class="question-card"><div class="question-text">{question_text.replace(chr(10), "<br>")}</div></div>', 
+        f'<div class="question-card"><div class="question-text">{text}</div></div>', 
         unsafe_allow_html=True
     )
     
@@ -255,8 +276,182 @@ def render_ai_theory(question_id, theory_text, auto_scroll=False):
         if auto_scroll:
             st.markdown(f'<script>scrollToElementWithRetry("theory-{question_id}");</script>', unsafe_allow_html=True)
 
-def render_navigation_buttons(idx_ptr, total, on_prev, on_next, on_jump):
-    """Render navigation buttons (Previous, Jump, Next)."""
+def render_tools_panel():
+    """Create the collapsible study tools panel. The sidebar is hidden by style.css."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    with st.expander(t('settings')):
+        left, right = st.columns([3, 2])
+    return left, right
+
+def render_filter_panel(tag_counts, on_filter, container):
+    """Render search input, service tag filter and result count."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    counts = dict(tag_counts)
+    with container:
+        query = st.text_input(t('search'), key='search_input', placeholder="e.g. dynamo kinesis")
+        tags = st.multiselect(
+            t('filter_services'),
+            options=[tag for tag, _ in tag_counts],
+            format_func=lambda tag: f"{tag} ({counts[tag]})",
+            key='tag_filter'
+        )
+        collapse = st.checkbox(t('hide_duplicates'), key='hide_duplicates')
+        shuffle = st.checkbox(t('shuffle'), key='shuffle_toggle')
+        result_count = on_filter(query, tags, collapse, shuffle)
+        if result_count == 0:
+            st.caption(t('no_matches'))
+        elif result_count:
+            st.caption(f"{t('total_qs')}: {result_count}")
+
+def render_progress_stats(stats, tag_stats, container, weakest=5):
+    """Render overall, session and weakest-service accuracy."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    pct = lambda correct, answered: f"{correct / answered:.0%}" if answered else "–"
+    
+    lines = [
+        f"<b>{t('total_qs')}:</b> {stats['total']}",
+        f"<b>{t('done')}:</b> {stats['answered']} ({pct(stats['correct'], stats['answered'])} {t('accuracy')})",
+    ]
+    if 'session_answered' in stats:
+        lines.append(f"<b>{t('this_session')}:</b> {stats['session_answered']} ({pct(stats['session_correct'], stats['session_answered'])})")
+    
+    # Weakest services with enough answers to be meaningful
+    weak = sorted(
+        ((correct / answered, tag, answered) for tag, (answered, correct) in tag_stats.items() if answered >= 3),
+    )[:weakest]
+    if weak:
+        lines.append(f"<b>{t('weakest_services')}:</b>")
+        lines.extend(f"&nbsp;&nbsp;{tag}: {acc:.0%} ({answered})" for acc, tag, answered in weak)
+    
+    with container:
+        st.markdown(f'<div style="font-size: 0.85rem; line-height: 1.6;">{"<br>".join(lines)}</div>', unsafe_allow_html=True)
+
+def render_memory_usage(usages, container):
+    """Render how much AI content this session keeps in server memory."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    items = sum(u['items'] for u in usages)
+    kb = sum(u['bytes'] for u in usages) / 1024
+    with container:
+        st.caption(f"{t('ai_memory')}: {items} · {kb:.0f} KB")
+
+def render_review_launcher(due_count, next_due, on_start, container):
+    """Render spaced-repetition status and start button."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    with container:
+        st.markdown(f"**{t('review_mode')}**")
+        if due_count:
+            if st.button(f"{t('btn_start_review')} ({due_count})", use_container_width=True):
+                on_start()
+        elif next_due:
+            import time
+            minutes = max(1, int((next_due - time.time()) // 60))
+            st.caption(f"{t('review_next_due')} {minutes} min")
+        else:
+            st.caption(t('review_empty'))
+        st.divider()
+
+def render_exam_launcher(on_start, container):
+    """Render controls for starting a mock exam."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    with container:
+        st.markdown(f"**{t('mock_exam')}**")
+        st.caption(t('mock_exam_desc'))
+        seed = st.text_input(t('exam_seed'), key='exam_seed_input', placeholder="random")
+        if st.button(t('btn_start_exam'), type="primary", use_container_width=True):
+            on_start(int(seed) if seed.strip().isdigit() else None)
+        st.divider()
+
+def render_exam_header(idx_ptr, total, answered, seed):
+    """Render exam progress header."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    st.markdown(f"""
+<div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 1rem;">
+    <span style="font-size: 1.5rem; font-weight: 700; color: #232f3e;">{t('question')} {idx_ptr+1} {t('of')} {total}</span>
+    <span style="font-size: 0.875rem; color: #64748b; font-weight: 500;">{t('done')}: {answered}/{total} · {t('exam_seed')}: {seed}</span>
+</div>
+    """, unsafe_allow_html=True)
+
+def render_exam_options(q, selected, key):
+    """Render answer inputs for an exam question and return the selected letters."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    letters = []
+    if q['is_multiselect']:
+        for opt in q['options']:
+            letter = opt.split('.')[0]
+            if st.checkbox(opt, value=letter in selected, key=f"{key}_{letter}"):
+                letters.append(letter)
+    else:
+        index = next((i for i, opt in enumerate(q['options']) if opt.split('.')[0] == selected), None)
+        sel = st.radio(t('select_answer'), q['options'], index=index, key=key, label_visibility="collapsed")
+        if sel:
+            letters.append(sel.split('.')[0])
+    return "".join(sorted(letters))
+
+def render_exam_navigation(idx_ptr, total, on_prev, on_next, on_finish):
+    """Render exam navigation and finish buttons. on_prev/on_next run as click callbacks."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    st.divider()
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        st.button(t('btn_previous'), key='exam_prev', on_click=on_prev, use_container_width=True, disabled=idx_ptr == 0)
+    with c2:
+        if st.button(t('btn_finish_exam'), key='exam_finish', type="primary", use_container_width=True):
+            on_finish()
+    with c3:
+        st.button(t('btn_next'), key='exam_next', on_click=on_next, use_container_width=True, disabled=idx_ptr >= total - 1)
+
+def render_exam_result(result, review, on_exit):
+    """Render graded exam score and per-question review."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    status = t('exam_passed') if result['passed'] else t('exam_failed')
+    css = "success-msg" if result['passed'] else "error-msg"
+    st.markdown(f'''
+        <div class="{css}">
+            <span style="margin-left: 0.5rem;">{status} <strong>{result['scaled_score']}</strong> / 1000</span>
+        </div>
+    ''', unsafe_allow_html=True)
+    
+    c1, c2, c3 = st.columns(3)
+    c1.metric(t('correct_count'), f"{result['correct']}/{result['total']}")
+    c2.metric(t('done'), f"{result['answered']}/{result['total']}")
+    c3.metric(t('exam_duration'), f"{result['duration'] // 60} min")
+    
+    with st.expander(t('exam_review')):
+        for pos, (q, ans, credit) in enumerate(review):
+            mark = "✅" if credit >= 1 else ("🟡" if credit > 0 else "❌")
+            st.markdown(f"{mark} **{pos+1}.** #{q['id']} — {ans or '–'} / **{q['correct_answer']}**")
+    
+    if st.button(t('btn_exit_exam'), use_container_width=True):
+        on_exit()
+
+def render_related_questions(related, on_select):
+    """Render a strip of buttons linking to similar questions."""
+    # UI always in English
+    t = lambda key: get_text('en', key)
+    if not related:
+        return
+    st.caption(t('related_questions'))
+    cols = st.columns(len(related))
+    for col, (idx, rq) in zip(cols, related):
+        with col:
+            if st.button(f"#{rq['id']}", key=f"related_{idx}", help=rq['question'][:200], use_container_width=True):
+                on_select(idx)
+
+def render_navigation_buttons(idx_ptr, total, on_prev, on_next, on_jump, on_jump_id=None):
+    """Render navigation buttons (Previous, Jump, Next).
+    
+    The jump box takes a position ("12") or an official question id ("#361").
+    """
     # UI always in English
     t = lambda key: get_text('en', key)
     st.divider()
@@ -272,15 +467,19 @@ def render_navigation_buttons(idx_ptr, total, on_prev, on_next, on_jump):
         _, mid_input, mid_btn, _ = st.columns([3, 2, 1, 3])
         
         with mid_input:
-            new_val = st.number_input(
+            new_val = st.text_input(
                 t('go_to_question'), 
-                min_value=1, 
-                max_value=total, 
-                value=idx_ptr+1, 
+                value=str(idx_ptr+1), 
+                placeholder="12 / #361",
                 label_visibility="collapsed"
-            )
-            if new_val != idx_ptr + 1:
-                on_jump(new_val - 1)
+            ).strip()
+            if new_val.startswith('#') and on_jump_id is not None:
+                if on_jump_id(new_val) is False:
+                    st.caption(t('question_not_found'))
+            elif new_val.isdigit():
+                target = min(max(int(new_val), 1), total) - 1
+                if target != idx_ptr:
+                    on_jump(target)
                 
         with mid_btn:
             if st.button(t('btn_go'), use_container_width=True):
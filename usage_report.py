@@ -0,0 +1,70 @@
+import argparse
+from pathlib import Path
+
+from quiz_core.usage import DIMENSIONS, load_buckets, summarize
+
+
+ROOT = Path(__file__).parent
+DEFAULT_FILES = (ROOT / "ai_usage.json", ROOT / "ai_usage_api.json")
+
+
+def cost(group, price_in, price_out):
+    """USD for the group's tokens at per-million-token prices."""
+    return (group["prompt_tokens"] * price_in + group["completion_tokens"] * price_out) / 1e6
+
+
+def print_summary(summary, by, price_in, price_out):
+    header = "  ".join(f"{d:>18}" for d in by)
+    print(f"{header}  {'calls':>7} {'ok':>6} {'429':>6} {'prompt tok':>11} {'compl tok':>11} "
+          f"{'avg in':>7} {'avg out':>7} {'avg s':>6} {'max s':>6} {'USD':>9}")
+    for group in summary:
+        dims = "  ".join(f"{str(group[d]):>18}" for d in by)
+        print(f"{dims}  {group['calls']:>7} {group['ok']:>6} {group['rate_limited']:>6} "
+              f"{group['prompt_tokens']:>11} {group['completion_tokens']:>11} "
+              f"{group['mean_prompt_tokens']:>7.0f} {group['mean_completion_tokens']:>7.0f} "
+              f"{group['mean_latency']:>6.1f} {group['latency_max']:>6.1f} {cost(group, price_in, price_out):>9.4f}")
+
+
+def print_estimate(summary, generations, price_in, price_out):
+    """Tokens and cost of `generations` more successful calls per category, at the observed means."""
+    print(f"\nEstimate for {generations} generations per category:")
+    for group in summary:
+        projected = {
+            "prompt_tokens": group["mean_prompt_tokens"] * generations,
+            "completion_tokens": group["mean_completion_tokens"] * generations,
+        }
+        attempts = generations * group["calls"] / (group["ok"] or 1)  # Failed and rate-limited calls use quota too
+        print(f"  {group['category']:>14}: {projected['prompt_tokens']:,.0f} prompt + "
+              f"{projected['completion_tokens']:,.0f} completion tokens, ~{attempts:,.0f} requests, "
+              f"{group['mean_latency'] * attempts / 3600:.1f} h of generation, "
+              f"USD {cost(projected, price_in, price_out):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize Gemini token usage, latency and outcomes.")
+    parser.add_argument("files", nargs="*", help="Usage files (default: ai_usage.json and ai_usage_api.json)")
+    parser.add_argument("--by", default="category", help=f"Comma-separated grouping from {', '.join(DIMENSIONS)}")
+    parser.add_argument("--since", type=int, help="Only the last N hours")
+    parser.add_argument("--price-in", type=float, default=0.0, help="USD per million prompt tokens")
+    parser.add_argument("--price-out", type=float, default=0.0, help="USD per million completion tokens")
+    parser.add_argument("--estimate", type=int, help="Project tokens and cost of N generations per category")
+    args = parser.parse_args()
+
+    by = tuple(d.strip() for d in args.by.split(","))
+    unknown = [d for d in by if d not in DIMENSIONS]
+    if unknown:
+        parser.error(f"unknown grouping {', '.join(unknown)}; choose from {', '.join(DIMENSIONS)}")
+
+    files = [Path(f) for f in args.files] or [f for f in DEFAULT_FILES if f.exists()]
+    rows = [list(k) + v for path in files for k, v in load_buckets(path).items()]
+    if not rows:
+        print("No usage recorded.")
+        return
+
+    print_summary(summarize(rows, by, args.since), by, args.price_in, args.price_out)
+    if args.estimate:
+        print_estimate(summarize(rows, ("category",), args.since), args.estimate, args.price_in, args.price_out)
+
+
+if __name__ == "__main__":
+    main()
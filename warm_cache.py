@@ -0,0 +1,71 @@
+import argparse
+import os
+from pathlib import Path
+
+from bank_registry import discover_banks
+from quiz_core import AccessCounter, AIContentService, ContentCache, QuizService, UsageLedger, cache_backend_from_config
+from quiz_core.ai import GenerationFailed, parse_api_keys
+
+
+ROOT = Path(__file__).parent
+KINDS = ("explanations", "theories")
+
+
+def warm_order(service, code, counter):
+    """(question id, cache id) per distinct AI cache entry of a bank, most accessed first.
+
+    Near-duplicates share one cache entry, so only the first question of each
+    is listed; questions never accessed keep bank order at the end.
+    """
+    bank, store = service.bank(code), service.store(code)
+    first = {}
+    for idx in range(len(store)):
+        first.setdefault(bank.cache_id(store.cache_ids[idx]), store[idx]['id'])
+    return [(first[cache_id], cache_id) for cache_id in counter.ranked(first)]
+
+
+def warm(service, code, counter, langs, kinds=KINDS, limit=None, dry_run=False):
+    """Generate missing entries for the `limit` most accessed questions of a bank; returns counts per outcome."""
+    counts = {"cached": 0, "generated": 0, "failed": 0}
+    for question_id, cache_id in warm_order(service, code, counter)[:limit]:
+        for lang in langs:
+            for kind in kinds:
+                if service.ai_content(code, question_id, kind, lang):
+                    counts["cached"] += 1
+                    continue
+                if dry_run:
+                    print(f"would generate {kind} {cache_id} ({lang}, score {counter.score(cache_id):.2f})")
+                    continue
+                try:
+                    service.ai_content(code, question_id, kind, lang, generate=True)
+                    counts["generated"] += 1
+                except GenerationFailed as e:
+                    counts["failed"] += 1
+                    print(f"{kind} {cache_id} ({lang}): {e.message}")
+    return counts
+
+
+def main(config=os.environ):
+    parser = argparse.ArgumentParser(description="Pre-generate uncached AI content, most accessed questions first.")
+    parser.add_argument("--exam", action="append", help="Exam code to warm (repeatable); default all banks")
+    parser.add_argument("--lang", action="append", help="Language to generate (repeatable); default vi")
+    parser.add_argument("--kind", action="append", choices=KINDS, help="Content kind (repeatable); default both")
+    parser.add_argument("--limit", type=int, help="Only the N most accessed questions per exam")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be generated")
+    args = parser.parse_args()
+
+    banks = discover_banks(ROOT, ROOT / "banks")
+    cache_path = config.get("AI_CACHE_PATH", ROOT / "ai_cache.json")
+    ai = AIContentService(parse_api_keys(config), ContentCache(cache_backend_from_config(config, cache_path)),
+                          usage=UsageLedger(config.get("AI_USAGE_PATH", ROOT / "ai_usage.json")))
+    service = QuizService(banks, ai=ai)
+    # The app owns the counts file; read it without writing it back
+    counter = AccessCounter(config.get("ACCESS_COUNTS_PATH", ROOT / "access_counts.json"), writable=False)
+
+    for code in args.exam or list(banks):
+        counts = warm(service, code.upper(), counter, args.lang or ["vi"], args.kind or KINDS, args.limit, args.dry_run)
+        print(f"{code.upper()}: {counts['generated']} generated, {counts['cached']} already cached, {counts['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()